@@ -8,44 +8,89 @@ downloads their attachments to designated folders, and marks the emails as read.
 import time
 import sys
 import os
-from typing import List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
 from src.config.config_manager import ConfigManager
-from src.email.imap_client import ImapClient
-from src.models.account import Account
-from src.models.email_filter import EmailFilter
-from src.utils.logger import Logger
+from src.email.imap_client import ImapClient, IDLE_RENEW_SECONDS
+from src.models.filter_set import FilterSet
+from src.utils.logger import Logger, logger
 
+# Upper bound for the number of accounts processed at the same time
+MAX_ACCOUNT_WORKERS = 16
 
-def process_account(account: Account, filters: List[EmailFilter], logger: Logger, wkhtmltopdf_path: Optional[str] = None) -> int:
+
+def process_account(client: ImapClient, filters: FilterSet, logger: Logger) -> int:
     """
     Process a single email account.
     
     Args:
-        account: The account to process
+        client: The IMAP client of the account to process
         filters: The filters to apply
         logger: The logger instance
-        wkhtmltopdf_path: Optional path to wkhtmltopdf executable
         
     Returns:
         int: Number of attachments processed
     """
+    account = client.account
     logger.info(f"Processing account: {account.name}")
     
-    client = ImapClient(account, wkhtmltopdf_path=wkhtmltopdf_path)
     attachment_count = client.process_messages(filters)
     
     logger.info(f"Processed {attachment_count} attachments for account {account.name}")
     return attachment_count
 
 
+def wait_for_next_cycle(clients: List[ImapClient], check_interval: int, use_idle: bool, logger: Logger):
+    """
+    Wait until the next check cycle is due.
+    With IDLE enabled, the wait ends early as soon as any account reports new mail.
+    
+    Args:
+        clients: The IMAP clients of all accounts
+        check_interval: Check interval in minutes, the maximum time to wait
+        use_idle: Whether to wait with IMAP IDLE where the server supports it
+        logger: The logger instance
+    """
+    timeout = check_interval * 60
+    idle_clients = [client for client in clients if use_idle and client.supports_idle()]
+    
+    if not idle_clients:
+        logger.info(f"Sleeping for {check_interval} minutes until next check")
+        time.sleep(timeout)
+        return
+        
+    logger.info(f"Waiting up to {check_interval} minutes for new mail (IMAP IDLE)")
+    deadline = time.monotonic() + timeout
+    new_mail = threading.Event()
+    
+    def watch(client: ImapClient):
+        while not new_mail.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if client.idle_wait(min(remaining, IDLE_RENEW_SECONDS), new_mail):
+                logger.info(f"New mail for account {client.account.name}")
+                new_mail.set()
+                return
+            if not client.supports_idle():
+                # IDLE failed and the connection was dropped, wait out the interval
+                new_mail.wait(max(0, deadline - time.monotonic()))
+                return
+                
+    with ThreadPoolExecutor(max_workers=len(idle_clients)) as executor:
+        try:
+            list(executor.map(watch, idle_clients))
+        finally:
+            # Release the remaining watchers, e.g. on keyboard interrupt
+            new_mail.set()
+
+
 def main():
     """
     Main entry point for the application.
     """
-    # Initialize logger
-    logger = Logger()
-    
     # Load configuration
     config_manager = ConfigManager()
     if not config_manager.load():
@@ -75,18 +120,43 @@ def main():
         
     # Get check interval
     check_interval = config_manager.get_check_interval()
+    use_idle = config_manager.get_use_idle()
+    
+    # Create one client per account, their connections are reused across check cycles
+    wkhtmltopdf_path = config_manager.get_wkhtmltopdf_path()
+    clients = [ImapClient(account, wkhtmltopdf_path=wkhtmltopdf_path) for account in accounts]
     
     # Process accounts
     total_attachments = 0
     
     try:
         while True:
+            # Pick up changes to settings.json without a restart
+            if config_manager.reload_if_changed():
+                logger.info("Configuration changed, reloading settings")
+                logger.configure(
+                    config_manager.get_log_level(),
+                    config_manager.get_log_retention_days()
+                )
+                filters = config_manager.get_filters()
+                check_interval = config_manager.get_check_interval()
+                use_idle = config_manager.get_use_idle()
+                
+                if (config_manager.get_accounts() != accounts
+                        or config_manager.get_wkhtmltopdf_path() != wkhtmltopdf_path):
+                    # Reconnect with the new account and converter settings
+                    for client in clients:
+                        client.close()
+                    accounts = config_manager.get_accounts()
+                    wkhtmltopdf_path = config_manager.get_wkhtmltopdf_path()
+                    clients = [ImapClient(account, wkhtmltopdf_path=wkhtmltopdf_path) for account in accounts]
+                    
             logger.info("Starting email check cycle")
             
-            cycle_attachments = 0
-            for account in accounts:
-                attachments = process_account(account, filters, logger, config_manager.get_wkhtmltopdf_path())
-                cycle_attachments += attachments
+            # Accounts are independent and I/O-bound, so they are processed in parallel.
+            # Each client is only used by one worker at a time.
+            with ThreadPoolExecutor(max_workers=min(len(clients), MAX_ACCOUNT_WORKERS)) as executor:
+                cycle_attachments = sum(executor.map(lambda client: process_account(client, filters, logger), clients))
                 
             total_attachments += cycle_attachments
             logger.info(f"Completed check cycle. Processed {cycle_attachments} attachments.")
@@ -96,15 +166,17 @@ def main():
                 logger.info(f"Single check completed. Total attachments processed: {total_attachments}")
                 break
                 
-            # Otherwise sleep until next check
-            logger.info(f"Sleeping for {check_interval} minutes until next check")
-            time.sleep(check_interval * 60)
+            # Otherwise wait until next check
+            wait_for_next_cycle(clients, check_interval, use_idle, logger)
             
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt. Exiting.")
     except Exception as e:
         logger.critical(f"Unhandled exception: {e}")
         sys.exit(1)
+    finally:
+        for client in clients:
+            client.close()
         
     logger.info("IMAP File Mover completed successfully")
 
@@ -3,10 +3,12 @@ Configuration manager for loading and parsing application settings.
 """
 import json
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
 
 from src.models.account import Account
 from src.models.email_filter import EmailFilter
+from src.models.filter_set import FilterSet
+from src.models.settings import Settings
 
 
 class ConfigManager:
@@ -24,11 +26,14 @@ class ConfigManager:
         self.config_path = config_path
         self.config_data = {}
         self.accounts = []
-        self.filters = []
+        self.filters = FilterSet([])
         self.check_interval_minutes = 0
+        self.use_idle = True  # Wake up early on new mail via IMAP IDLE
         self.log_level = "INFO"
         self.log_retention_days = 3  # Default to 3 days
         self.wkhtmltopdf_path = None  # Optional path to wkhtmltopdf executable
+        self._mtime_ns = None  # Modification time of the loaded configuration file
+        self._rejected_mtime_ns = None  # Modification time of a changed file that was not applied
         
     def load(self) -> bool:
         """
@@ -53,34 +58,102 @@ class ConfigManager:
                 else:
                     print(f"Configuration file {self.config_path} not found and no example file available.")
                     return False
+        except Exception as e:
+            print(f"Error loading configuration: {e}")
+            return False
+            
+        settings = self._read()
+        if settings is None:
+            return False
             
-            # Load the configuration file
+        self._apply(settings)
+        return True
+        
+    def _read(self) -> Optional[Settings]:
+        """
+        Read and parse the configuration file without applying it, so a broken
+        file never leaves the settings half updated.
+        
+        Returns:
+            Optional[Settings]: The parsed settings, None if the file could not be read
+        """
+        try:
+            # Remember which version of the file was read
+            mtime_ns = os.stat(self.config_path).st_mtime_ns
             with open(self.config_path, 'r') as f:
-                self.config_data = json.load(f)
+                config_data = json.load(f)
                 
-            # Parse accounts
-            self.accounts = [
-                Account.from_dict(account_data)
-                for account_data in self.config_data.get('accounts', [])
-            ]
+            return Settings(
+                config_data=config_data,
+                accounts=[
+                    Account.from_dict(account_data)
+                    for account_data in config_data.get('accounts', [])
+                ],
+                filters=FilterSet([
+                    EmailFilter.from_dict(filter_data)
+                    for filter_data in config_data.get('filters', [])
+                ]),
+                check_interval_minutes=config_data.get('check_interval_minutes', 0),
+                use_idle=config_data.get('use_idle', True),
+                log_level=config_data.get('log_level', 'INFO'),
+                log_retention_days=config_data.get('log_retention_days', 3),
+                wkhtmltopdf_path=config_data.get('wkhtmltopdf_path'),
+                mtime_ns=mtime_ns
+            )
+        except Exception as e:
+            print(f"Error loading configuration: {e}")
+            return None
             
-            # Parse filters
-            self.filters = [
-                EmailFilter.from_dict(filter_data)
-                for filter_data in self.config_data.get('filters', [])
-            ]
+    def _apply(self, settings: Settings):
+        """
+        Replace the current settings with settings returned by _read.
+        
+        Args:
+            settings: The parsed settings
+        """
+        self.config_data = settings.config_data
+        self.accounts = settings.accounts
+        self.filters = settings.filters
+        self.check_interval_minutes = settings.check_interval_minutes
+        self.use_idle = settings.use_idle
+        self.log_level = settings.log_level
+        self.log_retention_days = settings.log_retention_days
+        self.wkhtmltopdf_path = settings.wkhtmltopdf_path
+        self._mtime_ns = settings.mtime_ns
             
-            # Parse other settings
-            self.check_interval_minutes = self.config_data.get('check_interval_minutes', 0)
-            self.log_level = self.config_data.get('log_level', 'INFO')
-            self.log_retention_days = self.config_data.get('log_retention_days', 3)
-            self.wkhtmltopdf_path = self.config_data.get('wkhtmltopdf_path')
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the configuration file if it was modified since it was last loaded.
+        An unchanged file costs a single stat call. A changed file that cannot be read
+        or has no accounts or filters is rejected and the current settings are kept.
+        
+        Returns:
+            bool: True if the configuration was reloaded, False otherwise
+        """
+        try:
+            mtime_ns = os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return False
             
-            return True
-        except Exception as e:
-            print(f"Error loading configuration: {e}")
+        if mtime_ns == self._mtime_ns or mtime_ns == self._rejected_mtime_ns:
             return False
             
+        settings = self._read()
+        if settings is None:
+            error = "the file could not be read"
+        elif not settings.accounts:
+            error = "no accounts configured"
+        elif not settings.filters:
+            error = "no filters configured"
+        else:
+            self._apply(settings)
+            return True
+            
+        # Report a broken version once, the next change of the file is tried again
+        print(f"Ignoring changed configuration, {error}. Keeping the current settings.")
+        self._rejected_mtime_ns = mtime_ns
+        return False
+            
     def get_accounts(self) -> List[Account]:
         """
         Get the list of configured accounts.
@@ -90,12 +163,12 @@ class ConfigManager:
         """
         return self.accounts
         
-    def get_filters(self) -> List[EmailFilter]:
+    def get_filters(self) -> FilterSet:
         """
-        Get the list of configured email filters.
+        Get the configured email filters.
         
         Returns:
-            List[EmailFilter]: List of email filters
+            FilterSet: The email filters
         """
         return self.filters
         
@@ -108,6 +181,15 @@ class ConfigManager:
         """
         return self.check_interval_minutes
         
+    def get_use_idle(self) -> bool:
+        """
+        Get whether IMAP IDLE should be used to wait for new mail between checks.
+        
+        Returns:
+            bool: True if IDLE should be used
+        """
+        return self.use_idle
+        
     def get_log_level(self) -> str:
         """
         Get the configured log level.
@@ -2,23 +2,98 @@
 IMAP client for connecting to email servers and retrieving messages.
 This extends the base library's ImapClient to add file-moving specific functionality.
 """
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Iterator, TYPE_CHECKING
+import functools
+import itertools
+import logging
 import os
+import threading
+import time
 import re
-from pathlib import Path
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 # Import from the imap_client_python library
 # Install with: pip install git+https://github.com/BenjaminKobjolke/imap_client_python.git
 from imap_client_lib import ImapClient as BaseImapClient
 from imap_client_lib import EmailMessage, Attachment
+from imapclient import SEEN
+from imapclient.exceptions import IMAPClientError
 
 from src.models.account import Account
 from src.models.email_filter import EmailFilter
-from src.utils.logger import Logger
-from src.utils.html_to_pdf import HtmlConverter
+from src.models.filter_set import FilterSet
+from src.utils.email_headers import parse_from_and_subject
+from src.utils.logger import logger
 from src.utils.markdown_frontmatter import FrontmatterGenerator
 
+if TYPE_CHECKING:
+    from src.utils.html_to_pdf import HtmlConverter
+
+# Maximum number of messages retrieved per FETCH command. Keeps single
+# responses below the size limits some servers enforce.
+FETCH_BATCH_SIZE = 200
+
+# Maximum combined message size retrieved per FETCH command. Bounds the memory
+# held for raw messages when mails carry large attachments.
+FETCH_BATCH_BYTES = 20 * 1024 * 1024
+
+# Servers may end an IDLE session after 30 minutes (RFC 2177), so it is renewed before that
+IDLE_RENEW_SECONDS = 25 * 60
+
+# How often a running IDLE session checks whether it was asked to stop
+IDLE_POLL_SECONDS = 1
+
+# Safety margin for the SINCE search criterion. SINCE only compares dates in the
+# server's time zone, so a day is added to never miss mail from the last check.
+SINCE_MARGIN = timedelta(days=1)
+
+# Time between full searches of all unread mail. Mail that stayed unread after a
+# failed conversion or was moved back into the folder is older than SINCE_MARGIN,
+# so only a full search picks it up again.
+FULL_SEARCH_INTERVAL = timedelta(days=1)
+
+# Header fields requested to pre-check messages before downloading them
+PREFILTER_FETCH = 'BODY.PEEK[HEADER.FIELDS (FROM SUBJECT)]'
+
+# URLs in plain text or HTML email bodies
+URL_PATTERN = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Whitespace runs, including newlines and tabs, collapsed to one space in filenames
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Translation table deleting Windows forbidden characters < > : " | ? * \ / and control characters
+FORBIDDEN_FILENAME_CHARS = str.maketrans('', '', '<>:"|?*\\/' + ''.join(map(chr, range(0x20))) + '\x7f')
+
+# Reserved Windows device names that cannot be used as filenames
+RESERVED_NAMES = frozenset({
+    'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4',
+    'COM5', 'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2',
+    'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
+})
+
+# Number of attachments written to disk in parallel while further messages are fetched
+SAVE_WORKERS = 4
+
+# Number of URL downloads and conversions running in parallel at the end of a cycle
+CONVERT_WORKERS = 4
+
+
+@functools.lru_cache(maxsize=4)
+def get_html_converter(wkhtmltopdf_path: Optional[str] = None) -> 'HtmlConverter':
+    """
+    Get the HTML converter for a wkhtmltopdf path, shared by all clients.
+    The converter and its dependencies are only imported when first needed.
+
+    Args:
+        wkhtmltopdf_path: Optional path to wkhtmltopdf executable
+
+    Returns:
+        HtmlConverter: The converter
+    """
+    from src.utils.html_to_pdf import HtmlConverter
+    return HtmlConverter(logger=logger, wkhtmltopdf_path=wkhtmltopdf_path)
+
 
 class ImapClient(BaseImapClient):
     """
@@ -35,31 +110,426 @@ class ImapClient(BaseImapClient):
             wkhtmltopdf_path: Optional path to wkhtmltopdf executable
         """
         # Initialize the custom logger
-        self.custom_logger = Logger()
+        self.custom_logger = logger
         
-        # Initialize the HTML converter
-        self.html_converter = HtmlConverter(logger=self.custom_logger, wkhtmltopdf_path=wkhtmltopdf_path)
+        # The shared HTML converter is created on first use, see html_converter
+        self._wkhtmltopdf_path = wkhtmltopdf_path
         
         # Initialize the base client with the custom logger
         super().__init__(account, logger=self.custom_logger)
+
+        # Whether a server connection is currently open and reusable across cycles
+        self._connected = False
+
+        # Folder names known to exist on the server, loaded on first move
+        self._folder_cache: Optional[set] = None
+
+        # Local directories already created, so they are not re-checked for every file
+        self._ensured_dirs: set = set()
+
+        # Time of the last successful search and the filters it used. Later searches
+        # only look at mail that arrived since then.
+        self._last_check: Optional[datetime] = None
+        self._searched_filters = None
+        # Time of the last search over all unread mail
+        self._last_full_search: Optional[datetime] = None
+
+        # Write attachments in the background, threads are started on first use
+        self._io_pool = ThreadPoolExecutor(max_workers=SAVE_WORKERS, thread_name_prefix="save")
+
+    @property
+    def html_converter(self) -> 'HtmlConverter':
+        """
+        The HTML converter for body and URL filters, shared by all clients so
+        accounts reuse one HTTP session. Accounts that only save attachments
+        never load it.
+        """
+        return get_html_converter(self._wkhtmltopdf_path)
+
+    def connect(self) -> bool:
+        """
+        Connect to the IMAP server and remember the connection state.
+        """
+        self._connected = bool(super().connect())
+        return self._connected
+
+    def disconnect(self):
+        """
+        Disconnect from the IMAP server if a connection is open.
+        """
+        if not self._connected:
+            return
+        self._connected = False
+        self._folder_cache = None
+        super().disconnect()
+
+    def close(self):
+        """
+        Disconnect from the server and stop the background workers of this client.
+        """
+        self.disconnect()
+        self._io_pool.shutdown(wait=True)
+
+    def ensure_connected(self) -> bool:
+        """
+        Make sure a usable connection exists, reusing the open one when possible.
+        An open connection is checked with NOOP and re-established if the server dropped it.
+
+        Returns:
+            bool: True if the client is connected, False otherwise
+        """
+        if self._connected:
+            try:
+                self.client.noop()
+                return True
+            except (IMAPClientError, OSError) as e:
+                self.logger.warning(f"Connection for account {self.account.name} lost ({e}), reconnecting")
+                self.disconnect()
+
+        return self.connect()
+
+    def supports_idle(self) -> bool:
+        """
+        Check whether the open connection supports IMAP IDLE.
+
+        Returns:
+            bool: True if the server advertises the IDLE capability
+        """
+        if not self._connected:
+            return False
+        try:
+            return self.client.has_capability('IDLE')
+        except (IMAPClientError, OSError) as e:
+            self.logger.warning(f"Could not query capabilities for account {self.account.name}: {e}")
+            return False
+
+    def idle_wait(self, timeout: float = IDLE_RENEW_SECONDS, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Wait in IMAP IDLE until the server reports new mail or the timeout expires.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+            stop_event: Optional event that ends the wait early when set
+
+        Returns:
+            bool: True if the server reported new mail, False otherwise
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            self.client.idle()
+            try:
+                while stop_event is None or not stop_event.is_set():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    responses = self.client.idle_check(timeout=min(remaining, IDLE_POLL_SECONDS))
+                    for response in responses:
+                        if len(response) > 1 and response[1] in (b'EXISTS', b'RECENT'):
+                            self.logger.debug("IDLE reported new mail for account %s", self.account.name)
+                            return True
+                return False
+            finally:
+                self.client.idle_done()
+        except (IMAPClientError, OSError) as e:
+            self.logger.warning(f"IDLE failed for account {self.account.name}: {e}")
+            self.disconnect()
+            return False
     
-    def mark_as_read(self, message_id: str) -> bool:
+    def search_unread_ids(self, filters: Optional[List[EmailFilter]] = None) -> List[int]:
+        """
+        Search unread messages, letting the server pre-select by the filters' sender and subject
+        when the account enables server_side_search. Some servers (Gmail, Dovecot with full-text
+        search) match whole words only and may leave out messages the filters match locally,
+        which is why the option is off by default. The filters are still applied to every
+        fetched message.
+        Between full searches of all unread mail, which run once per FULL_SEARCH_INTERVAL and
+        whenever the filters changed, only mail that arrived since the last check is considered.
+
+        Args:
+            filters: Optional filters to push down to the server
+
+        Returns:
+            List[int]: IDs of the candidate messages in mailbox order
+        """
+        started = datetime.now()
+        if filters is not self._searched_filters:
+            # Changed filters may match older unread mail
+            self._last_check = None
+        full_search = (
+            self._last_check is None
+            or self._last_full_search is None
+            or started - self._last_full_search >= FULL_SEARCH_INTERVAL
+        )
+
+        unread = ['UNSEEN']
+        if not full_search:
+            unread += ['SINCE', (self._last_check - SINCE_MARGIN).date()]
+
+        message_ids = self._search_unread(filters, unread)
+
+        if full_search:
+            self._last_full_search = started
+        self._last_check = started
+        self._searched_filters = filters
+        return message_ids
+
+    def _search_unread(self, filters: Optional[List[EmailFilter]], unread: list) -> List[int]:
+        """
+        Run the unread searches for the given filters.
+
+        Args:
+            filters: Optional filters to push down to the server
+            unread: Base criteria selecting the unread messages
+
+        Returns:
+            List[int]: IDs of the candidate messages in mailbox order
+        """
+        if filters is None or not self.account.server_side_search:
+            return self.client.search(unread)
+
+        searches = []
+        for email_filter in filters:
+            if not email_filter.matches_account(self.account.name):
+                continue
+
+            criteria = list(unread)
+            if email_filter.sender:
+                criteria += ['FROM', email_filter.sender]
+            if email_filter.subject:
+                criteria += ['SUBJECT', email_filter.subject]
+
+            if len(criteria) == len(unread):
+                # Filter without sender and subject matches every unread message
+                return self.client.search(unread)
+            if criteria not in searches:
+                searches.append(criteria)
+
+        message_ids = set()
+        for criteria in searches:
+            charset = None if all(str(c).isascii() for c in criteria) else 'UTF-8'
+            message_ids.update(self.client.search(criteria, charset=charset))
+
+        return sorted(message_ids)
+
+    def prefilter_ids(self, message_ids: List[int], filters: List[EmailFilter]) -> List[int]:
         """
-        Override to use custom logger's important method.
+        Drop messages whose sender and subject match no filter, downloading only their
+        From and Subject headers instead of the full messages.
+
+        Args:
+            message_ids: IDs of the candidate messages
+            filters: The filters to match against
+
+        Returns:
+            List[int]: IDs of the messages that may match a filter, in the given order
         """
-        result = super().mark_as_read(message_id)
-        if result:
-            self.custom_logger.important(f"Marked message {message_id} as read")
-        return result
+        applicable = [f for f in filters if f.matches_account(self.account.name)]
+        if not applicable:
+            return []
+        if any(not f.sender and not f.subject for f in applicable):
+            # At least one filter matches every sender and subject
+            return message_ids
+
+        keep_ids = []
+        for start in range(0, len(message_ids), FETCH_BATCH_SIZE):
+            batch = message_ids[start:start + FETCH_BATCH_SIZE]
+            response = self.client.fetch(batch, [PREFILTER_FETCH])
+
+            for message_id in batch:
+                # The server may echo the section name with different quoting
+                raw_headers = next(
+                    (value for key, value in response.get(message_id, {}).items() if key.startswith(b'BODY[HEADER')),
+                    None
+                )
+                if raw_headers is None:
+                    # Cannot decide without the headers, let the full check handle it
+                    keep_ids.append(message_id)
+                    continue
+
+                try:
+                    email_from, subject = parse_from_and_subject(raw_headers)
+                except Exception as e:
+                    # Undecodable headers, let the full check handle the message
+                    self.logger.debug("Could not decode headers of message %s: %s", message_id, e)
+                    keep_ids.append(message_id)
+                    continue
+                if any(f.matches_email(email_from, subject) for f in applicable):
+                    keep_ids.append(message_id)
+
+        self.logger.debug("%d of %d unread messages passed the header check", len(keep_ids), len(message_ids))
+        return keep_ids
+
+    def _fetch_batches(self, message_ids: List[int]) -> Iterator[List[int]]:
+        """
+        Split message IDs into FETCH batches bounded by message count and total size.
+
+        Args:
+            message_ids: The IDs to fetch
+
+        Returns:
+            Iterator[List[int]]: Batches of message IDs in the given order
+        """
+        sizes = self.client.fetch(message_ids, ['RFC822.SIZE']) if message_ids else {}
+
+        batch = []
+        batch_bytes = 0
+        for message_id in message_ids:
+            size = sizes.get(message_id, {}).get(b'RFC822.SIZE', 0)
+            if batch and (len(batch) >= FETCH_BATCH_SIZE or batch_bytes + size > FETCH_BATCH_BYTES):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append(message_id)
+            batch_bytes += size
+
+        if batch:
+            yield batch
+
+    def iter_unread_messages(self, filters: Optional[List[EmailFilter]] = None) -> Iterator[Tuple[int, EmailMessage]]:
+        """
+        Retrieve unread messages one at a time, fetching them in batches instead of
+        issuing one FETCH round trip per message. Raw message data is released as soon
+        as a message is parsed, so at most one batch is held in memory.
+
+        Args:
+            filters: Optional filters used to pre-select messages before their
+                bodies are downloaded
+
+        Returns:
+            Iterator[Tuple[int, EmailMessage]]: UID and message of the unread messages in mailbox order
+
+        Raises:
+            IMAPClientError, OSError: If the search or a fetch fails, so the caller can drop the connection
+        """
+        message_ids = self.search_unread_ids(filters)
+        self.logger.debug("Found %d unread messages", len(message_ids))
+
+        if filters is not None:
+            message_ids = self.prefilter_ids(message_ids, filters)
+
+        for batch in self._fetch_batches(message_ids):
+            response = self.client.fetch(batch, ['BODY.PEEK[]'])
+
+            for message_id in batch:
+                data = response.pop(message_id, None)
+                if not data or b'BODY[]' not in data:
+                    self.logger.warning(f"No body returned for message {message_id}")
+                    continue
+
+                try:
+                    email_message = EmailMessage.from_bytes(str(message_id), data.pop(b'BODY[]'), self.logger)
+                except Exception as e:
+                    # Skip only the unparsable message, it stays unread
+                    self.logger.error(f"Failed to parse message {message_id}: {e}")
+                    continue
+                if email_message:
+                    yield message_id, email_message
+
+    def get_unread_messages(self, filters: Optional[List[EmailFilter]] = None) -> List[Tuple[int, EmailMessage]]:
+        """
+        Retrieve all unread messages.
+
+        Args:
+            filters: Optional filters used to pre-select messages on the server
+
+        Returns:
+            List[Tuple[int, EmailMessage]]: UID and message of the unread messages in mailbox order
+
+        Raises:
+            IMAPClientError, OSError: If the search or a fetch fails
+        """
+        return list(self.iter_unread_messages(filters))
+
+    @staticmethod
+    def _format_ids(message_ids: List[int]) -> str:
+        """
+        Format message UIDs for log output.
+        """
+        return ', '.join(map(str, message_ids))
+
+    def mark_as_read(self, message_id: int) -> bool:
+        """
+        Mark a single message as read.
+        """
+        return self.mark_messages_as_read([message_id])
+
+    def mark_messages_as_read(self, message_ids: List[int]) -> bool:
+        """
+        Mark several messages as read with a single STORE command.
+
+        Args:
+            message_ids: UIDs of the messages
+
+        Returns:
+            bool: True if the messages were marked, False otherwise
+        """
+        if not message_ids:
+            return True
+
+        try:
+            self.client.add_flags(message_ids, [SEEN])
+        except Exception as e:
+            self.logger.error(f"Failed to mark messages {self._format_ids(message_ids)} as read: {e}")
+            return False
+
+        self.custom_logger.important(f"Marked messages {self._format_ids(message_ids)} as read")
+        return True
     
-    def move_to_folder(self, message_id: str, folder: str) -> bool:
+    def ensure_folder(self, folder: str):
+        """
+        Create an IMAP folder unless it exists. The folder list is requested once
+        per connection and cached, instead of listing folders for every moved message.
+
+        Args:
+            folder: Name of the folder
+        """
+        if self._folder_cache is None:
+            self._folder_cache = {name for _flags, _delimiter, name in self.client.list_folders()}
+
+        if folder not in self._folder_cache:
+            self.client.create_folder(folder)
+            self._folder_cache.add(folder)
+            self.logger.info(f"Created folder '{folder}'")
+
+    def move_to_folder(self, message_id: int, folder: str) -> bool:
+        """
+        Move a single message to another IMAP folder.
         """
-        Override to use custom logger's important method.
+        return self.move_messages_to_folder([message_id], folder)
+
+    def move_messages_to_folder(self, message_ids: List[int], folder: str) -> bool:
         """
-        result = super().move_to_folder(message_id, folder)
-        if result and folder:
-            self.custom_logger.important(f"Moved message {message_id} to folder '{folder}'")
-        return result
+        Move several messages to another IMAP folder with a single command,
+        creating the folder if needed.
+        
+        Args:
+            message_ids: UIDs of the messages
+            folder: Name of the target folder
+            
+        Returns:
+            bool: True if the messages were moved (or nothing had to be moved), False otherwise
+        """
+        if not folder or not message_ids:
+            return True
+
+        try:
+            self.ensure_folder(folder)
+
+            if self.client.has_capability('MOVE'):
+                self.client.move(message_ids, folder)
+            else:
+                self.client.copy(message_ids, folder)
+                self.client.delete_messages(message_ids)
+                if self.client.has_capability('UIDPLUS'):
+                    self.client.expunge(message_ids)
+                else:
+                    self.client.expunge()
+        except Exception as e:
+            self.logger.error(f"Failed to move messages {self._format_ids(message_ids)} to folder '{folder}': {e}")
+            return False
+
+        self.custom_logger.important(f"Moved messages {self._format_ids(message_ids)} to folder '{folder}'")
+        return True
     
     def extract_urls_from_body(self, body: str, url_prefix: str) -> List[str]:
         """
@@ -72,18 +542,23 @@ class ImapClient(BaseImapClient):
         Returns:
             List[str]: List of matching URLs
         """
-        # Pattern to find URLs
-        url_pattern = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
-        
-        # Find all URLs in the body
-        all_urls = url_pattern.findall(body)
+        # Every URL starts with 'http' and every matching one contains the prefix,
+        # so bodies without either need no regex scan
+        start = body.find('http')
+        if start < 0 or url_prefix not in body:
+            self.logger.debug("Found 0 URLs matching prefix '%s'", url_prefix)
+            return []
+            
+        # Find all URLs in the body, starting at the first possible URL
+        all_urls = URL_PATTERN.findall(body, start)
         
         # Filter URLs that start with the specified prefix
         matching_urls = [url for url in all_urls if url.startswith(url_prefix)]
         
-        self.logger.debug(f"Found {len(matching_urls)} URLs matching prefix '{url_prefix}'")
-        for url in matching_urls:
-            self.logger.debug(f"  - {url}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Found %d URLs matching prefix '%s'", len(matching_urls), url_prefix)
+            for url in matching_urls:
+                self.logger.debug("  - %s", url)
         
         return matching_urls
     
@@ -113,30 +588,27 @@ class ImapClient(BaseImapClient):
         if not filename:
             return "untitled"
 
-        # First, normalize all whitespace including newlines, tabs, etc. to single spaces
-        safe_name = re.sub(r'\s+', ' ', filename)
+        # First, normalize all whitespace including newlines, tabs, etc. to single spaces.
+        # Any whitespace other than a single space is non-printable, so most names skip the regex.
+        safe_name = filename
+        if '  ' in safe_name or not safe_name.isprintable():
+            safe_name = WHITESPACE_PATTERN.sub(' ', safe_name)
 
-        # Remove or replace problematic characters
+        # Remove problematic characters in a single pass
         # Windows forbidden characters: < > : " | ? * \ /
         # Also remove control characters and other problematic ones
-        safe_name = re.sub(r'[<>:"|?*\\/\x00-\x1f\x7f]', '', safe_name)
+        safe_name = safe_name.translate(FORBIDDEN_FILENAME_CHARS)
 
         # Remove leading/trailing whitespace and periods (Windows issue)
         safe_name = safe_name.strip(' .')
 
-        # Ensure it's not a reserved Windows name
-        reserved_names = {
-            'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4',
-            'COM5', 'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2',
-            'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-        }
-
-        if safe_name.upper() in reserved_names:
+        # Ensure it's not a reserved Windows name (all of them have 3 or 4 characters)
+        if len(safe_name) <= 4 and safe_name.upper() in RESERVED_NAMES:
             safe_name = f"{safe_name}_file"
 
-        # Truncate to max length
+        # Truncate to max length, the start is already stripped
         if len(safe_name) > max_length:
-            safe_name = safe_name[:max_length].strip(' .')
+            safe_name = safe_name[:max_length].rstrip(' .')
 
         # If empty after sanitization, use default
         if not safe_name:
@@ -144,6 +616,55 @@ class ImapClient(BaseImapClient):
 
         return safe_name
 
+    def ensure_directory(self, directory: str):
+        """
+        Create a local directory unless it was already created by this client.
+
+        Args:
+            directory: Path of the directory
+        """
+        if directory not in self._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(directory)
+
+    def save_attachment(self, attachment: Attachment, target_folder: str, sanitize_filename: bool = True) -> Optional[str]:
+        """
+        Save an attachment to the target folder without overwriting existing files.
+
+        Args:
+            attachment: The attachment to save
+            target_folder: Folder to save the attachment in
+            sanitize_filename: Whether to make the filename safe for the filesystem
+
+        Returns:
+            Optional[str]: Path of the saved file, or None if saving failed
+        """
+        filename = attachment.filename or "attachment"
+        if sanitize_filename:
+            filename = self.sanitize_filename(filename, 200)
+
+        try:
+            self.ensure_directory(target_folder)
+
+            # Create the file exclusively, adding a counter to the name if it already exists.
+            # Checking and creating in one step cannot race with other writers.
+            name, ext = os.path.splitext(filename)
+            file_path = os.path.join(target_folder, filename)
+            for counter in itertools.count(1):
+                try:
+                    f = open(file_path, 'xb')
+                    break
+                except FileExistsError:
+                    file_path = os.path.join(target_folder, f"{name}_{counter}{ext}")
+
+            with f:
+                f.write(attachment.data)
+        except Exception as e:
+            self.logger.error(f"Failed to save attachment {attachment.filename}: {e}")
+            return None
+
+        return file_path
+
     def generate_filename(self, email_message: EmailMessage, email_filter: EmailFilter, extension: str) -> str:
         """
         Generate filename for attachment based on email and filter.
@@ -156,14 +677,13 @@ class ImapClient(BaseImapClient):
         Returns:
             str: Generated filename
         """
-        timestamp = datetime.now().strftime("%Y%m%d")
+        now = datetime.now()
         safe_subject = self.sanitize_filename(email_message.subject, 50)
         
         if email_filter.attachment_type == "body":
-            return f"{timestamp}_{safe_subject}.{extension}"
+            return f"{now:%Y%m%d}_{safe_subject}.{extension}"
         else:
-            timestamp_full = datetime.now().strftime("%Y%m%d_%H%M%S")
-            return f"{safe_subject}_{timestamp_full}.{extension}"
+            return f"{safe_subject}_{now:%Y%m%d_%H%M%S}.{extension}"
     
     def extract_inline_images(self, email_message: EmailMessage, target_folder: str) -> Dict[str, str]:
         """
@@ -191,9 +711,6 @@ class ImapClient(BaseImapClient):
                     content_id = content_id.strip('<>')
 
                 # Generate unique filename with timestamp and index
-                import time
-                # Add a small delay to ensure unique timestamps
-                time.sleep(0.01)
                 timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")[:-3]  # Include milliseconds
                 # Add index to ensure uniqueness
                 unique_suffix = f"{timestamp}_{idx:02d}"
@@ -225,7 +742,7 @@ class ImapClient(BaseImapClient):
                         cid_mapping[f"cid:{content_id}"] = image_filename
                         cid_mapping[content_id] = image_filename
 
-                    self.logger.debug(f"Extracted inline image to _resources: {image_filename} (CID: {content_id})")
+                    self.logger.debug("Extracted inline image to _resources: %s (CID: %s)", image_filename, content_id)
 
                 except Exception as e:
                     self.logger.error(f"Failed to save inline image: {e}")
@@ -292,13 +809,82 @@ class ImapClient(BaseImapClient):
                     'size': size_str
                 })
 
-                self.logger.debug(f"Extracted attachment to _resources: {safe_filename}")
+                self.logger.debug("Extracted attachment to _resources: %s", safe_filename)
 
             except Exception as e:
                 self.logger.error(f"Failed to save attachment {original_filename}: {e}")
 
         return attachment_info
     
+    def _process_regular_attachments(self, email_message: EmailMessage, email_filter: EmailFilter,
+                                     target_folder: str) -> List[Future]:
+        """
+        Save the attachments of an email that match a filter in the background.
+        
+        Args:
+            email_message: The email message
+            email_filter: The filter that matched the email
+            target_folder: Folder to save the attachments in
+            
+        Returns:
+            List[Future]: One pending save per matching attachment, each resolving
+            to the number of files written (0 or 1)
+        """
+        if not email_message.attachments:
+            self.logger.debug("Email has no attachments")
+            return []
+            
+        saves = []
+        for attachment in email_message.attachments:
+            # Reject other file types before the full (and logged) attachment check
+            if not email_filter.matches_extension(attachment.filename):
+                self.logger.debug("Attachment '%s' did not match", attachment.filename)
+                continue
+            if email_filter.matches_attachment(attachment.filename, self.logger):
+                self.logger.debug("Attachment '%s' matched", attachment.filename)
+                saves.append(self._io_pool.submit(self._save_matched_attachment, attachment, target_folder))
+            else:
+                self.logger.debug("Attachment '%s' did not match", attachment.filename)
+                
+        if not saves:
+            self.logger.debug("No attachments matched the filter")
+        return saves
+    
+    def _save_matched_attachment(self, attachment: Attachment, target_folder: str) -> int:
+        """
+        Save an attachment that matched a filter.
+        
+        Args:
+            attachment: The attachment to save
+            target_folder: Folder to save the attachment in
+            
+        Returns:
+            int: Number of files written (0 or 1)
+        """
+        saved_path = self.save_attachment(attachment, target_folder, sanitize_filename=True)
+        if not saved_path:
+            return 0
+        self.custom_logger.important(f"Saved attachment {saved_path}")
+        return 1
+    
+    @staticmethod
+    def get_message_body(email_message: EmailMessage, content_type: str) -> str:
+        """
+        Get a body part of an email, decoding each content type only once per message
+        even when several filters look at the same email.
+
+        Args:
+            email_message: The email message
+            content_type: The content type, e.g. "text/html"
+
+        Returns:
+            str: The body, empty if the email has no such part
+        """
+        bodies = email_message.__dict__.setdefault('_bodies', {})
+        if content_type not in bodies:
+            bodies[content_type] = email_message.get_body(content_type) or ""
+        return bodies[content_type]
+
     def process_body_attachment(self, email_message: EmailMessage, email_filter: EmailFilter) -> int:
         """
         Process email body as attachment by converting to specified format.
@@ -315,8 +901,11 @@ class ImapClient(BaseImapClient):
             self.logger.error("No target folder specified for body attachment")
             return 0
 
-        # Get email body (prefer HTML, fallback to plain text)
-        body = email_message.get_body("text/html") or email_message.get_body("text/plain") or ""
+        # Get email body (prefer HTML, fallback to plain text). PDF output requires HTML,
+        # so the plain text body is only decoded for markdown.
+        body = self.get_message_body(email_message, "text/html")
+        if not body and email_filter.target_format.lower() == "md":
+            body = self.get_message_body(email_message, "text/plain")
 
         # Trim whitespace from the body content
         body = body.strip()
@@ -382,28 +971,34 @@ class ImapClient(BaseImapClient):
             self.logger.error(f"Failed to create {email_filter.target_format.upper()} from email body")
             return 0
     
-    def process_url_attachment(self, email_message: EmailMessage, email_filter: EmailFilter) -> int:
+    def _prepare_url_attachment(self, email_message: EmailMessage,
+                                email_filter: EmailFilter) -> Optional[Tuple[str, str]]:
         """
-        Process URL-based attachment by downloading HTML and converting to specified format.
+        Find the URL to convert for an email and the path of the file to create.
         
         Args:
             email_message: The email message
             email_filter: The filter with URL attachment criteria
             
         Returns:
-            int: Number of files created (0 or 1)
+            Optional[Tuple[str, str]]: (url, output_path), or None if there is nothing to convert
         """
         url_prefix = email_filter.url_prefix or email_filter.url_to_attachment
         if not url_prefix:
-            return 0
+            return None
         
         target_folder = self.get_target_folder(email_filter)
         if not target_folder:
             self.logger.error("No target folder specified for URL attachment")
-            return 0
+            return None
         
         # Get email body (try plain text first, then HTML)
-        body = email_message.get_body("text/plain") or email_message.get_body("text/html") or ""
+        body = self.get_message_body(email_message, "text/plain") or self.get_message_body(email_message, "text/html")
+        
+        # Most emails do not contain the prefix at all, skip copying and scanning them
+        if url_prefix not in body:
+            self.logger.debug("No URLs found matching prefix: %s", url_prefix)
+            return None
         
         # Trim whitespace from the body content
         body = body.strip()
@@ -412,8 +1007,8 @@ class ImapClient(BaseImapClient):
         matching_urls = self.extract_urls_from_body(body, url_prefix)
         
         if not matching_urls:
-            self.logger.debug(f"No URLs found matching prefix: {url_prefix}")
-            return 0
+            self.logger.debug("No URLs found matching prefix: %s", url_prefix)
+            return None
         
         # Process the first matching URL
         url = matching_urls[0]
@@ -422,113 +1017,250 @@ class ImapClient(BaseImapClient):
         # Generate filename
         extension = "md" if email_filter.target_format.lower() == "md" else "pdf"
         filename = self.generate_filename(email_message, email_filter, extension)
-        output_path = os.path.join(target_folder, filename)
+        return url, os.path.join(target_folder, filename)
+    
+    def _convert_url(self, url: str, output_path: str, target_format: str) -> int:
+        """
+        Download a URL and convert it to the target format.
+        
+        Args:
+            url: URL to download
+            output_path: Path of the file to create
+            target_format: Target format ("pdf" or "md")
+            
+        Returns:
+            int: Number of files created (0 or 1)
+        """
+        converted = self.html_converter.download_and_convert(url, output_path, target_format)
+        return self._log_url_result(url, output_path, target_format, converted)
+    
+    def _log_url_result(self, url: str, output_path: str, target_format: str, converted: bool) -> int:
+        """
+        Log the outcome of a URL conversion.
         
-        # Download and convert to target format
-        if self.html_converter.download_and_convert(url, output_path, email_filter.target_format):
-            self.custom_logger.important(f"Created {email_filter.target_format.upper()} from URL: {output_path}")
+        Args:
+            url: The converted URL
+            output_path: Path of the file to create
+            target_format: Target format ("pdf" or "md")
+            converted: Whether the conversion succeeded
+            
+        Returns:
+            int: Number of files created (0 or 1)
+        """
+        if converted:
+            self.custom_logger.important(f"Created {target_format.upper()} from URL: {output_path}")
             return 1
         else:
-            self.logger.error(f"Failed to create {email_filter.target_format.upper()} from URL: {url}")
+            self.logger.error(f"Failed to create {target_format.upper()} from URL: {url}")
             return 0
+    
+    def _convert_urls(self, url_jobs_by_uid: Dict[int, List[Tuple[str, str, str]]]) -> Dict[int, int]:
+        """
+        Download and convert the URLs found in several messages in parallel.
+        
+        Args:
+            url_jobs_by_uid: (url, output_path, target_format) jobs by message UID
+            
+        Returns:
+            Dict[int, int]: Number of files created by message UID
+        """
+        jobs = [(uid, job) for uid, uid_jobs in url_jobs_by_uid.items() for job in uid_jobs]
+        if not jobs:
+            return {}
+            
+        converted_by_uid: Dict[int, int] = {}
+        try:
+            results = self.html_converter.download_and_convert_many(
+                [job for _, job in jobs], max_workers=CONVERT_WORKERS
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to convert URLs of account {self.account.name}: {e}")
+            return converted_by_uid
+            
+        for (uid, job), converted in zip(jobs, results):
+            converted_by_uid[uid] = converted_by_uid.get(uid, 0) + self._log_url_result(*job, converted)
+        return converted_by_uid
+    
+    def process_url_attachment(self, email_message: EmailMessage, email_filter: EmailFilter) -> int:
+        """
+        Process URL-based attachment by downloading HTML and converting to specified format.
+        
+        Args:
+            email_message: The email message
+            email_filter: The filter with URL attachment criteria
             
+        Returns:
+            int: Number of files created (0 or 1)
+        """
+        job = self._prepare_url_attachment(email_message, email_filter)
+        if not job:
+            return 0
+        return self._convert_url(*job, email_filter.target_format)
+    
     def process_messages(self, filters: List[EmailFilter]) -> int:
         """
         Process unread messages, download matching attachments, and mark as read.
+        The connection is kept open afterwards so the next cycle can reuse it.
         
         Args:
-            filters: List of email filters to apply
+            filters: Email filters to apply, as list or FilterSet
             
         Returns:
             int: Number of attachments processed
         """
         attachment_count = 0
+        filter_set = filters if isinstance(filters, FilterSet) else FilterSet(filters)
+        # Select the filters for this account once instead of per message
+        filter_set = filter_set.for_account(self.account.name)
+        if not filter_set:
+            self.logger.debug("No filters apply to account %s", self.account.name)
+            return 0
+        
+        # Resolve each filter's processing mode once per cycle instead of per message
+        applicable = []
+        for i, email_filter in enumerate(filter_set):
+            if email_filter.attachment_type == "body":
+                mode = "body"
+            elif email_filter.attachment_type == "url" or email_filter.url_to_attachment:
+                mode = "url"
+            else:  # attachment_type == "attachment" (default)
+                mode = "attachment"
+            
+            target_folder = self.get_target_folder(email_filter)
+            if mode == "attachment" and not target_folder:
+                self.logger.error(f"No target folder specified for regular attachments of filter #{i + 1}")
+                continue
+            applicable.append((i + 1, email_filter, mode, target_folder))
+        
+        # Extensions wanted by any regular attachment filter, checked in one pass per email.
+        # None if some filter accepts every extension.
+        attachment_suffixes = tuple(dict.fromkeys(
+            email_filter.extension_suffix for _, email_filter, mode, _ in applicable if mode == "attachment"
+        ))
+        if not all(attachment_suffixes):
+            attachment_suffixes = None
         
-        def process_email(email_message: EmailMessage) -> bool:
+        def process_email(email_message: EmailMessage, pending: List[Future],
+                          url_jobs: List[Tuple[str, str, str]]) -> bool:
             """
             Process individual email based on filters.
+            Regular attachments are saved in the background, their futures are added to
+            pending instead of being counted right away. URLs to convert are added to
+            url_jobs and converted together once all messages were fetched.
             """
             nonlocal attachment_count
             
-            self.logger.debug(f"Processing message ID: {email_message.message_id}")
-            self.logger.debug(f"From: '{email_message.from_address}'")
-            self.logger.debug(f"Subject: '{email_message.subject}'")
-            self.logger.debug(f"Attachments: {len(email_message.attachments)}")
+            # Skip building debug messages entirely unless debug logging is on
+            dbg = self.logger.isEnabledFor(logging.DEBUG)
+            if dbg:
+                self.logger.debug("Processing message ID: %s", email_message.message_id)
+                self.logger.debug("From: '%s'", email_message.from_address)
+                self.logger.debug("Subject: '%s'", email_message.subject)
+                self.logger.debug(
+                    "Attachments: %d %s",
+                    len(email_message.attachments),
+                    [(attachment.filename, attachment.content_type) for attachment in email_message.attachments]
+                )
+            
+            # Reject messages no filter can match without trying each filter
+            if not filter_set.might_match(email_message.from_address, email_message.subject):
+                self.logger.debug("Message did not match any filters")
+                return False
             
-            if email_message.attachments:
-                for attachment in email_message.attachments:
-                    self.logger.debug(f"Attachment filename: '{attachment.filename}'")
-                    self.logger.debug(f"Attachment content type: '{attachment.content_type}'")
+            # Whether any attachment has a wanted extension, determined on first use
+            has_wanted_attachment = None
             
             # Check if message matches any filter
-            for i, email_filter in enumerate(filters):
-                self.logger.debug(f"Trying filter #{i+1}: account='{email_filter.account}', sender='{email_filter.sender}', subject='{email_filter.subject}', ext='{email_filter.attachment_extension}'")
+            for number, email_filter, mode, target_folder in applicable:
+                if dbg:
+                    self.logger.debug(
+                        "Trying filter #%d: account='%s', sender='%s', subject='%s', ext='%s'",
+                        number, email_filter.account, email_filter.sender, email_filter.subject, email_filter.attachment_extension
+                    )
                 
-                # First check if the filter applies to this account
-                if not email_filter.matches_account(self.account.name, self.logger):
-                    self.logger.debug(f"Filter #{i+1} skipped - not for account '{self.account.name}'")
+                if not email_filter.matches_email(email_message.from_address, email_message.subject, self.logger):
+                    self.logger.debug("Email did not match filter #%d", number)
                     continue
                 
-                if email_filter.matches_email(email_message.from_address, email_message.subject, self.logger):
-                    self.logger.debug(f"Email matched filter #{i+1}")
-                    self.logger.debug(f"Filter #{i+1} attachment_type: {email_filter.attachment_type}")
-                    
-                    processed_count = 0
-                    
-                    # Process based on attachment type
-                    if email_filter.attachment_type == "body":
-                        self.logger.debug(f"Filter #{i+1} processes email body")
-                        processed_count = self.process_body_attachment(email_message, email_filter)
-                    
-                    elif email_filter.attachment_type == "url" or email_filter.url_to_attachment:
-                        self.logger.debug(f"Filter #{i+1} processes URL attachment")
-                        processed_count = self.process_url_attachment(email_message, email_filter)
-                    
-                    else:  # attachment_type == "attachment" (default)
-                        self.logger.debug(f"Filter #{i+1} processes regular attachments")
-                        attachment_matched = False
-                        target_folder = self.get_target_folder(email_filter)
-                        
-                        if not target_folder:
-                            self.logger.error("No target folder specified for regular attachments")
-                        else:
-                            for attachment in email_message.attachments:
-                                if email_filter.matches_attachment(attachment.filename, self.logger):
-                                    self.logger.debug(f"Attachment '{attachment.filename}' matched filter #{i+1}")
-                                    attachment_matched = True
-                                    
-                                    # Save attachment using target folder (filter override or account default)
-                                    saved_path = self.save_attachment(
-                                        attachment,
-                                        target_folder,
-                                        sanitize_filename=True
-                                    )
-                                    if saved_path:
-                                        processed_count += 1
-                                        self.custom_logger.important(f"Saved attachment {saved_path}")
-                                else:
-                                    self.logger.debug(f"Attachment '{attachment.filename}' did not match filter #{i+1}")
-                            
-                            if not attachment_matched and email_message.attachments:
-                                self.logger.debug(f"No attachments matched filter #{i+1}")
-                            elif not email_message.attachments:
-                                self.logger.debug("Email has no attachments")
-                    
+                self.logger.debug("Email matched filter #%d, processing mode: %s", number, mode)
+                
+                if mode == "body":
+                    processed_count = self.process_body_attachment(email_message, email_filter)
                     if processed_count > 0:
                         attachment_count += processed_count
                         return True  # Successfully processed attachment(s)
+                    continue
+                
+                if mode == "url":
+                    job = self._prepare_url_attachment(email_message, email_filter)
+                    if job:
+                        url_jobs.append((*job, email_filter.target_format))
                 else:
-                    self.logger.debug(f"Email did not match filter #{i+1}")
+                    if attachment_suffixes:
+                        if has_wanted_attachment is None:
+                            has_wanted_attachment = any(
+                                (attachment.filename or "").lower().endswith(attachment_suffixes)
+                                for attachment in email_message.attachments
+                            )
+                        if not has_wanted_attachment:
+                            self.logger.debug("No attachment has an extension any filter is looking for")
+                            continue
+                    pending.extend(self._process_regular_attachments(email_message, email_filter, target_folder))
+                if pending or url_jobs:
+                    # Counted and confirmed once the background work has finished
+                    return True
             
             self.logger.debug("Message did not match any filters")
             return False  # Message didn't match any filter
         
-        # Use the base class method with our custom callback
-        self.process_messages_with_callback(
-            callback=process_email,
-            search_criteria=['UNSEEN'],
-            mark_as_read=True,
-            move_to_folder=self.account.imap_move_folder
-        )
-        
+        if not self.ensure_connected():
+            return attachment_count
+
+        processed_ids = []
+        pending_by_uid: Dict[int, List[Future]] = {}
+        url_jobs_by_uid: Dict[int, List[Tuple[str, str, str]]] = {}
+        try:
+            try:
+                for uid, email_message in self.iter_unread_messages(filter_set):
+                    pending = []
+                    url_jobs = []
+                    try:
+                        matched = process_email(email_message, pending, url_jobs)
+                    except Exception as e:
+                        # Skip only this message, it stays unread and is retried next cycle
+                        self.logger.error(f"Failed to process message {uid} of account {self.account.name}: {e}")
+                        continue
+                    if matched:
+                        if pending or url_jobs:
+                            pending_by_uid[uid] = pending
+                            if url_jobs:
+                                url_jobs_by_uid[uid] = url_jobs
+                        else:
+                            processed_ids.append(uid)
+            finally:
+                # Convert the URLs of all messages in parallel
+                converted_by_uid = self._convert_urls(url_jobs_by_uid)
+                
+                # A message with background work is processed once at least one file was
+                # written for it, otherwise it stays unread and is retried next cycle
+                for uid, pending in pending_by_uid.items():
+                    processed_count = converted_by_uid.get(uid, 0)
+                    for future in pending:
+                        try:
+                            processed_count += future.result()
+                        except Exception as e:
+                            self.logger.error(f"Failed to save or convert a file of message {uid}: {e}")
+                    if processed_count > 0:
+                        attachment_count += processed_count
+                        processed_ids.append(uid)
+                        
+                # Flag and move all processed messages with one command each
+                if processed_ids:
+                    self.mark_messages_as_read(processed_ids)
+                    self.move_messages_to_folder(processed_ids, self.account.imap_move_folder)
+        except (IMAPClientError, OSError) as e:
+            # Drop the broken connection, the next cycle reconnects
+            self.logger.error(f"IMAP error while processing account {self.account.name}: {e}")
+            self.disconnect()
+
         return attachment_count
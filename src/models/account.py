@@ -17,6 +17,22 @@ class Account(BaseAccount):
     """
     target_folder: str = ''
     imap_move_folder: Optional[str] = None
+    server_side_search: bool = False  # Pre-select messages by filter sender/subject on the server
+
+    # Configuration keys read by from_dict and their defaults
+    _DEFAULTS = {
+        # Base Account fields
+        'name': '',
+        'server': '',
+        'username': '',
+        'password': '',
+        'port': 993,
+        'use_ssl': True,
+        # Application-specific fields
+        'target_folder': '',
+        'imap_move_folder': None,
+        'server_side_search': False,
+    }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Account':
@@ -29,15 +45,4 @@ class Account(BaseAccount):
         Returns:
             Account: New Account instance
         """
-        return cls(
-            # Base Account fields
-            name=data.get('name', ''),
-            server=data.get('server', ''),
-            username=data.get('username', ''),
-            password=data.get('password', ''),
-            port=data.get('port', 993),
-            use_ssl=data.get('use_ssl', True),
-            # Application-specific fields
-            target_folder=data.get('target_folder', ''),
-            imap_move_folder=data.get('imap_move_folder')
-        )
+        return cls(**{key: data.get(key, default) for key, default in cls._DEFAULTS.items()})
@@ -1,6 +1,8 @@
 """
 Email filter model for matching emails based on criteria.
 """
+import logging
+import sys
 from dataclasses import dataclass, field
 from typing import Optional, Any, Dict
 
@@ -22,6 +24,40 @@ class EmailFilter:
     account: Optional[str] = None  # Optional account name filter
     markdown_config: Optional[Dict[str, Any]] = field(default=None)  # Optional markdown configuration with properties
 
+    # Normalized match values, precomputed by compile()
+    _ext_suffix: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _name_lc: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """
+        Compile the match values once when the filter is created.
+        """
+        # The mode tags are compared for every matched email, interned strings compare by identity first
+        if isinstance(self.attachment_type, str):
+            self.attachment_type = sys.intern(self.attachment_type)
+        if isinstance(self.target_format, str):
+            self.target_format = sys.intern(self.target_format)
+        self.compile()
+
+    def compile(self) -> 'EmailFilter':
+        """
+        Precompute the normalized values used by the match methods so they are not
+        rebuilt for every checked attachment. Call again after changing the criteria.
+
+        Returns:
+            EmailFilter: This filter
+        """
+        self._ext_suffix = f'.{self.attachment_extension.lower()}' if self.attachment_extension else None
+        self._name_lc = self.attachment_name.lower() if self.attachment_name else None
+        return self
+
+    @property
+    def extension_suffix(self) -> Optional[str]:
+        """
+        The lowercase '.ext' suffix attachment filenames must end with, None if any extension matches.
+        """
+        return self._ext_suffix
+
     @classmethod
     def from_dict(cls, data: dict) -> 'EmailFilter':
         """
@@ -68,18 +104,21 @@ class EmailFilter:
         Returns:
             bool: True if the filter applies to this account, False otherwise
         """
+        # Only build debug messages when they are actually logged
+        dbg = logger is not None and logger.isEnabledFor(logging.DEBUG)
+
         if not self.account:
             # If no account filter is set, apply to all accounts
-            if logger:
+            if dbg:
                 logger.debug("Filter has no account restriction, applies to all accounts")
             return True
         
         if self.account == account_name:
-            if logger:
+            if dbg:
                 logger.debug(f"Filter account '{self.account}' matches account '{account_name}'")
             return True
         else:
-            if logger:
+            if dbg:
                 logger.debug(f"Filter account '{self.account}' does not match account '{account_name}'")
             return False
     
@@ -95,27 +134,52 @@ class EmailFilter:
         Returns:
             bool: True if the email matches the filter criteria, False otherwise
         """
-        if logger:
+        # A filter without sender and subject criteria matches every email
+        if not self.sender and not self.subject:
+            return True
+            
+        # Only build debug messages when they are actually logged
+        dbg = logger is not None and logger.isEnabledFor(logging.DEBUG)
+
+        if dbg:
             logger.debug(f"Checking email match - From: '{email_from}', Subject: '{email_subject}'")
             logger.debug(f"Filter criteria - Sender: '{self.sender}', Subject: '{self.subject}'")
         
         # Check sender match if filter has a sender criteria
         if self.sender and self.sender not in email_from:
-            if logger:
+            if dbg:
                 logger.debug(f"Sender mismatch - Filter: '{self.sender}' not in '{email_from}'")
             return False
             
         # Check subject match if filter has a subject criteria (ignore if not set)
         if self.subject and self.subject not in email_subject:
-            if logger:
+            if dbg:
                 logger.debug(f"Subject mismatch - Filter: '{self.subject}' not in '{email_subject}'")
             return False
             
         # If we get here, all specified criteria match
-        if logger:
+        if dbg:
             logger.debug("Email matches filter criteria")
         return True
     
+    def matches_extension(self, filename: str) -> bool:
+        """
+        Check if a filename has this filter's attachment extension, ignoring case.
+        Only the end of the filename is lowercased, not the whole name.
+
+        Args:
+            filename: The filename to check
+
+        Returns:
+            bool: True if the filename has the extension or the filter has no extension criteria
+        """
+        if not self._ext_suffix:
+            return True
+        if not filename:
+            # Unnamed parts, e.g. inline images, have no extension
+            return False
+        return filename[-len(self._ext_suffix):].lower() == self._ext_suffix
+
     def matches_attachment(self, filename: str, logger: Any = None) -> bool:
         """
         Check if a filename matches this filter's attachment criteria.
@@ -127,28 +191,31 @@ class EmailFilter:
         Returns:
             bool: True if the filename matches the filter criteria, False otherwise
         """
-        if logger:
+        # Only build debug messages when they are actually logged
+        dbg = logger is not None and logger.isEnabledFor(logging.DEBUG)
+
+        if dbg:
             logger.debug(f"Checking attachment match - Filename: '{filename}'")
             logger.debug(f"Filter criteria - Extension: '{self.attachment_extension}', Name: '{self.attachment_name}'")
 
         # Check extension filter
-        if self.attachment_extension:
-            if not filename.lower().endswith(f'.{self.attachment_extension.lower()}'):
-                if logger:
+        if self._ext_suffix:
+            if not self.matches_extension(filename):
+                if dbg:
                     logger.debug(f"Attachment extension mismatch - Expected: '{self.attachment_extension}'")
                 return False
-            if logger:
+            if dbg:
                 logger.debug(f"Attachment matches extension filter: '{self.attachment_extension}'")
 
         # Check attachment_name filter (substring match, case-insensitive)
-        if self.attachment_name:
-            if self.attachment_name.lower() not in filename.lower():
-                if logger:
+        if self._name_lc:
+            if not filename or self._name_lc not in filename.lower():
+                if dbg:
                     logger.debug(f"Attachment name mismatch - '{self.attachment_name}' not in '{filename}'")
                 return False
-            if logger:
+            if dbg:
                 logger.debug(f"Attachment matches name filter: '{self.attachment_name}'")
 
-        if logger:
+        if dbg:
             logger.debug("Attachment matches all filter criteria")
         return True
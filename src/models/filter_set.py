@@ -0,0 +1,84 @@
+"""
+Filter set model for matching emails against all configured filters.
+"""
+import re
+from typing import Dict, Iterator, List, Optional, Pattern
+
+from src.models.email_filter import EmailFilter
+
+
+class FilterSet:
+    """
+    Ordered collection of email filters.
+    Combines the sender and subject criteria of all filters into one alternation
+    regex each, so messages that cannot match any filter are rejected in a single pass.
+    The filters that apply to an account are selected once and cached per account name.
+    """
+
+    def __init__(self, filters: List[EmailFilter]):
+        """
+        Initialize the filter set.
+
+        Args:
+            filters: The email filters, in the order they are applied
+        """
+        self.filters = list(filters)
+        self._sender_pattern = self._combine([f.sender for f in self.filters])
+        self._subject_pattern = self._combine([f.subject for f in self.filters])
+        self._by_account: Dict[str, 'FilterSet'] = {}
+
+    @staticmethod
+    def _combine(values: List[Optional[str]]) -> Optional[Pattern]:
+        """
+        Combine substring criteria into one alternation regex.
+
+        Args:
+            values: The criteria of all filters
+
+        Returns:
+            Optional[Pattern]: The combined pattern, or None if any filter has no
+            criteria for this field and therefore matches every value
+        """
+        if not values or not all(values):
+            return None
+        return re.compile('|'.join(re.escape(value) for value in dict.fromkeys(values)))
+
+    def for_account(self, account_name: str) -> 'FilterSet':
+        """
+        Get the filters that apply to an account, in their configured order.
+
+        Args:
+            account_name: The name of the account
+
+        Returns:
+            FilterSet: The filters for the account
+        """
+        account_filters = self._by_account.get(account_name)
+        if account_filters is None:
+            account_filters = FilterSet([f for f in self.filters if f.matches_account(account_name)])
+            self._by_account[account_name] = account_filters
+        return account_filters
+
+    def might_match(self, email_from: str, email_subject: str) -> bool:
+        """
+        Quick check whether an email can match any filter of the set.
+        A True result still requires checking the individual filters.
+
+        Args:
+            email_from: The sender of the email
+            email_subject: The subject of the email
+
+        Returns:
+            bool: False if no filter can match the email, True otherwise
+        """
+        if self._sender_pattern and not self._sender_pattern.search(email_from):
+            return False
+        if self._subject_pattern and not self._subject_pattern.search(email_subject):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[EmailFilter]:
+        return iter(self.filters)
+
+    def __len__(self) -> int:
+        return len(self.filters)
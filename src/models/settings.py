@@ -0,0 +1,24 @@
+"""
+Settings model holding one parsed version of the configuration file.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.models.account import Account
+from src.models.filter_set import FilterSet
+
+
+@dataclass
+class Settings:
+    """
+    Represents the settings read from the configuration file.
+    """
+    config_data: Dict[str, Any] = field(default_factory=dict)
+    accounts: List[Account] = field(default_factory=list)
+    filters: FilterSet = field(default_factory=lambda: FilterSet([]))
+    check_interval_minutes: int = 0
+    use_idle: bool = True  # Wake up early on new mail via IMAP IDLE
+    log_level: str = "INFO"
+    log_retention_days: int = 3
+    wkhtmltopdf_path: Optional[str] = None  # Optional path to wkhtmltopdf executable
+    mtime_ns: Optional[int] = None  # Modification time of the file these settings were read from
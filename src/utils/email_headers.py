@@ -0,0 +1,59 @@
+"""
+Decoding of raw email headers fetched before the full message is downloaded.
+"""
+from email.header import Header, decode_header, make_header
+from email.parser import BytesHeaderParser
+from typing import Tuple
+
+# Parses the pre-check headers without looking for a body. Holds no state between calls.
+HEADER_PARSER = BytesHeaderParser()
+
+# Charset the compat32 parser assigns to raw 8-bit header bytes
+UNKNOWN_8BIT = 'unknown-8bit'
+
+
+def decode_header_value(value) -> str:
+    """
+    Decode a raw header value, unfolding continuation lines and RFC 2047 encoded words.
+
+    Args:
+        value: Header value as bytes, str or email.header.Header
+
+    Returns:
+        str: The decoded value, empty if the header is missing
+    """
+    if not value:
+        return ''
+    if isinstance(value, Header):
+        # The parser returns a Header instead of a str when the value holds raw 8-bit
+        # bytes, which mail clients send as UTF-8 in practice
+        value = ''.join(
+            chunk.decode('utf-8' if charset in (None, UNKNOWN_8BIT) else charset, errors='replace')
+            if isinstance(chunk, bytes) else chunk
+            for chunk, charset in decode_header(value)
+        )
+    elif isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+    # Unfold long headers that were continued on several lines
+    value = ''.join(value.splitlines())
+    # Every RFC 2047 encoded word starts with '=?', plain headers need no decoding
+    if '=?' not in value:
+        return value
+    try:
+        return str(make_header(decode_header(value)))
+    except Exception:
+        return value
+
+
+def parse_from_and_subject(raw_headers: bytes) -> Tuple[str, str]:
+    """
+    Parse the decoded From and Subject values out of raw header bytes.
+
+    Args:
+        raw_headers: The raw header section, or only some of its fields
+
+    Returns:
+        Tuple[str, str]: (from, subject), empty strings for missing headers
+    """
+    headers = HEADER_PARSER.parsebytes(raw_headers)
+    return decode_header_value(headers.get('From')), decode_header_value(headers.get('Subject'))
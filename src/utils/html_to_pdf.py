@@ -3,18 +3,132 @@ HTML converter with redirect handling - supports PDF and Markdown output.
 """
 import re
 import os
-import tempfile
+import html
+import itertools
+import platform
+import secrets
+import shutil
+import threading
+import time
 import requests
 import pdfkit
-from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from urllib3.util.retry import Retry
+from pdfkit.configuration import Configuration
+from bs4 import BeautifulSoup, SoupStrainer
+from markdownify import MarkdownConverter
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Optional, Tuple, List, Dict
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor
 from src.utils.logger import Logger
 
+# Parser used by BeautifulSoup. lxml parses several times faster, html.parser works without it.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Whether wkhtmltopdf is searched in the usual Windows install locations
+IS_WINDOWS = platform.system() == 'Windows'
+
+# pdfkit turns <meta name="<prefix>..."> tags of HTML passed as a string into wkhtmltopdf
+# command line options. Emails and downloaded pages are untrusted, so the prefix is random
+# per process and cannot be guessed by their authors.
+PDFKIT_META_TAG_PREFIX = f'pdfkit-{secrets.token_hex(16)}-'
+
+# wkhtmltopdf options for every PDF conversion, read-only since they are shared
+PDF_OPTIONS = MappingProxyType({
+    'page-size': 'A4',
+    'margin-top': '0.75in',
+    'margin-right': '0.75in',
+    'margin-bottom': '0.75in',
+    'margin-left': '0.75in',
+    'encoding': "UTF-8",
+    'no-outline': None,
+    'enable-local-file-access': None
+})
+
+# Connections kept open per host, enough for the parallel URL conversions
+# each downloading their images in parallel
+HTTP_POOL_SIZE = 32
+
+# Images of one page downloaded at the same time
+IMAGE_DOWNLOAD_WORKERS = 8
+
+# Size of the pieces an image is written to disk in
+IMAGE_CHUNK_BYTES = 65536
+
+# Retries for transient gateway errors when downloading pages and images
+HTTP_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False)
+
+# Number of downloaded images remembered per converter, so repeated logos and
+# tracking pixels are saved once per output directory
+IMAGE_CACHE_SIZE = 1024
+
+# Bytes of a page checked for a meta refresh before the rest of it is downloaded
+HTML_PREFIX_BYTES = 16384
+
+# Meta refresh redirects remembered per converter and how long they are trusted, so wrapper
+# and tracking URLs shared by several emails are not downloaded again within one run
+REDIRECT_CACHE_SIZE = 512
+REDIRECT_CACHE_SECONDS = 300
+
+# Largest page downloaded for conversion, bigger pages are rejected instead of held in memory
+MAX_HTML_BYTES = 10 * 1024 * 1024
+
+# Opening <head> tag and any <base> tag, used to splice in a base tag without parsing the page
+HEAD_OPEN_PATTERN = re.compile(r'<head(?:\s[^>]*)?>', re.IGNORECASE)
+BASE_TAG_PATTERN = re.compile(r'<base[\s/>]', re.IGNORECASE)
+
+# Cheap test for a possible meta refresh tag, pages without a match are not parsed for it
+META_REFRESH_HINT_PATTERN = re.compile(r'http-equiv\s*=\s*["\']?\s*refresh', re.IGNORECASE)
+
+# Limits parsing to the meta refresh tags when looking for a redirect
+META_REFRESH_STRAINER = SoupStrainer('meta', attrs={'http-equiv': 'refresh'})
+
+# Redirect target in the content of a meta refresh tag, e.g. "0;url='https://...'"
+META_REFRESH_URL_PATTERN = re.compile(r"url=['\"]?([^'\"]+)['\"]?", re.IGNORECASE)
+
+# Three or more consecutive <br> tags, collapsed in the raw HTML before the Markdown conversion.
+# Non-breaking spaces count as whitespace, like the decoded \xa0 does.
+BR_RUN_PATTERN = re.compile(r'(<br\s*/?>(?:\s|&nbsp;|&#160;)*){3,}', re.IGNORECASE)
+
+# Paragraphs without content
+EMPTY_PARAGRAPH_PATTERN = re.compile(r'<p>(?:\s|&nbsp;|&#160;)*</p>', re.IGNORECASE)
+
+# Elements removed before the Markdown conversion
+DROPPED_TAGS = frozenset(('script', 'style', 'meta', 'link', 'head'))
+
+# Inline style and CSS class attributes, removed before the Markdown conversion
+STYLE_ATTRS = frozenset(('style', 'class'))
+
+# Attributes that don't translate well to Markdown, matched at the start of the attribute name
+UNWANTED_ATTR_PATTERN = re.compile(r'id|data-.*|aria-.*|role|tabindex|dir|lang', re.IGNORECASE)
+
+# HTML to Markdown converter, holds only its options so it is shared by all conversions
+MARKDOWN_CONVERTER = MarkdownConverter(
+    heading_style="ATX",  # Use # for headings instead of underlines
+    bullets="-"  # Use - for bullet points
+)
+
+# Whitespace cleanup applied to the converted Markdown
+LINE_EDGE_SPACES_PATTERN = re.compile(r' *\n *')
+SPACE_RUN_PATTERN = re.compile(r'[ \t]+')
+BLANK_LINE_PATTERN = re.compile(r'\n[ \t]+\n')
+DOUBLE_NEWLINE_PATTERN = re.compile(r'\n{2,}')
+
+# CSS that leaked through the conversion: rules, media queries and ID selectors
+CSS_RULE_PATTERN = re.compile(r'{[^}]*}')
+CSS_MEDIA_PATTERN = re.compile(r'@media[^{]*{[^}]*}')
+CSS_ID_SELECTOR_PATTERN = re.compile(r'#[a-zA-Z_][a-zA-Z0-9_-]*\s*{[^}]*}')
+
 
 class HtmlConverter:
     """
@@ -31,10 +145,32 @@ class HtmlConverter:
         """
         self.logger = logger or Logger()
         self.wkhtmltopdf_path = wkhtmltopdf_path
+        self._pdfkit_config = None  # Resolved wkhtmltopdf configuration, see _get_pdfkit_config
+        self._ensured_dirs: set = set()  # Output directories already created
+        self._image_cache: OrderedDict = OrderedDict()  # (output directory, image URL) -> local filename
+        self._image_cache_lock = threading.Lock()
+        self._redirect_cache: OrderedDict = OrderedDict()  # URL -> (redirect target, expiry time)
+        self._redirect_cache_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # Keep connections alive across downloads and retry transient server errors
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=HTTP_RETRY)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def ensure_directory(self, directory: str):
+        """
+        Create an output directory unless it was already created by this converter.
+        
+        Args:
+            directory: Path of the directory
+        """
+        if directory not in self._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(directory)
     
     def extract_meta_refresh_url(self, html_content: str) -> Optional[str]:
         """
@@ -46,14 +182,18 @@ class HtmlConverter:
         Returns:
             Optional[str]: The redirect URL if found, None otherwise
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Most pages have no meta refresh at all, skip building the tree for them
+        if not META_REFRESH_HINT_PATTERN.search(html_content):
+            return None
+        # Only build the meta refresh tags instead of the whole document
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=META_REFRESH_STRAINER)
         
         # Look for meta refresh tag
         meta_refresh = soup.find('meta', attrs={'http-equiv': 'refresh'})
         if meta_refresh:
             content = meta_refresh.get('content', '')
             # Extract URL from content like "0;url='https://...'"
-            match = re.search(r"url=['\"]?([^'\"]+)['\"]?", content, re.IGNORECASE)
+            match = META_REFRESH_URL_PATTERN.search(content)
             if match:
                 url = match.group(1)
                 self.logger.info(f"Found meta refresh redirect to: {url}")
@@ -73,29 +213,59 @@ class HtmlConverter:
             Tuple[str, str]: (final_url, html_content)
             
         Raises:
-            Exception: If download fails or too many redirects
+            Exception: If download fails, the page is too large or too many redirects
         """
         current_url = url
         redirect_count = 0
         
         while redirect_count < max_redirects:
+            # Follow a redirect found recently without downloading the page again
+            cached_redirect = self._get_cached_redirect(current_url)
+            if cached_redirect:
+                self.logger.debug(f"Following cached meta refresh redirect to: {cached_redirect}")
+                current_url = cached_redirect
+                redirect_count += 1
+                continue
+                
             try:
                 self.logger.debug(f"Downloading HTML from: {current_url}")
-                response = self.session.get(current_url, timeout=30)
-                response.raise_for_status()
-                
-                html_content = response.text
-                
-                # Check for meta refresh redirect
-                redirect_url = self.extract_meta_refresh_url(html_content)
+                with self.session.get(current_url, timeout=30, stream=True) as response:
+                    response.raise_for_status()
+                    
+                    # Reject pages that announce a size above the limit before reading them
+                    content_length = response.headers.get('content-length', '')
+                    if content_length.isdigit() and int(content_length) > MAX_HTML_BYTES:
+                        raise Exception(f"Page at {current_url} is larger than {MAX_HTML_BYTES} bytes")
+                    
+                    # Check the start of the page for a meta refresh redirect first,
+                    # the rest of a redirect page is never downloaded
+                    chunks = response.iter_content(HTML_PREFIX_BYTES)
+                    head = next(chunks, b'')
+                    html_content = self._decode_html(response, head)
+                    redirect_url = self.extract_meta_refresh_url(html_content)
+                        
+                    if not redirect_url:
+                        # Read the rest of the page, up to the size limit
+                        parts = [head]
+                        size = len(head)
+                        for chunk in chunks:
+                            size += len(chunk)
+                            if size > MAX_HTML_BYTES:
+                                raise Exception(f"Page at {current_url} is larger than {MAX_HTML_BYTES} bytes")
+                            parts.append(chunk)
+                            
+                        if len(parts) > 1:
+                            # Check the whole page
+                            html_content = self._decode_html(response, b''.join(parts))
+                            redirect_url = self.extract_meta_refresh_url(html_content)
                 
                 if redirect_url:
                     # Handle relative URLs
                     if not redirect_url.startswith(('http://', 'https://')):
-                        from urllib.parse import urljoin
                         redirect_url = urljoin(current_url, redirect_url)
                     
                     self.logger.info(f"Following meta refresh redirect to: {redirect_url}")
+                    self._cache_redirect(current_url, redirect_url)
                     current_url = redirect_url
                     redirect_count += 1
                 else:
@@ -109,6 +279,135 @@ class HtmlConverter:
         
         raise Exception(f"Too many redirects (>{max_redirects}) when downloading {url}")
     
+    def _get_cached_redirect(self, url: str) -> Optional[str]:
+        """
+        Look up the meta refresh redirect of a URL that was downloaded recently.
+        
+        Args:
+            url: The URL to look up
+            
+        Returns:
+            Optional[str]: The redirect target, or None if unknown or expired
+        """
+        with self._redirect_cache_lock:
+            cached = self._redirect_cache.get(url)
+            if not cached:
+                return None
+            redirect_url, expires = cached
+            if expires < time.monotonic():
+                del self._redirect_cache[url]
+                return None
+            self._redirect_cache.move_to_end(url)
+            return redirect_url
+            
+    def _cache_redirect(self, url: str, redirect_url: str):
+        """
+        Remember the meta refresh redirect of a URL for REDIRECT_CACHE_SECONDS.
+        
+        Args:
+            url: The downloaded URL
+            redirect_url: The absolute URL it redirects to
+        """
+        with self._redirect_cache_lock:
+            self._redirect_cache[url] = (redirect_url, time.monotonic() + REDIRECT_CACHE_SECONDS)
+            self._redirect_cache.move_to_end(url)
+            if len(self._redirect_cache) > REDIRECT_CACHE_SIZE:
+                self._redirect_cache.popitem(last=False)
+    
+    @staticmethod
+    def _decode_html(response: requests.Response, data: bytes) -> str:
+        """
+        Decode downloaded HTML the way response.text does, for a streamed response.
+        
+        Args:
+            response: The response the data was read from
+            data: The raw page content, or the start of it
+            
+        Returns:
+            str: The decoded content
+        """
+        encoding = response.encoding or chardet.detect(data)['encoding']
+        try:
+            return str(data, encoding, errors='replace')
+        except (LookupError, TypeError):
+            return str(data, errors='replace')
+    
+    def _get_pdfkit_config(self) -> Configuration:
+        """
+        Get the pdfkit configuration, locating wkhtmltopdf on first use only.
+        A failed lookup is not cached, so installing wkhtmltopdf later is picked up.
+
+        Returns:
+            Configuration: pdfkit configuration pointing at wkhtmltopdf
+
+        Raises:
+            IOError: If wkhtmltopdf cannot be found
+        """
+        if self._pdfkit_config is not None:
+            return self._pdfkit_config
+
+        config = None
+
+        # First, check if a path was provided in configuration
+        if self.wkhtmltopdf_path and os.path.exists(self.wkhtmltopdf_path):
+            config = pdfkit.configuration(wkhtmltopdf=self.wkhtmltopdf_path, meta_tag_prefix=PDFKIT_META_TAG_PREFIX)
+            self.logger.info(f"Using configured wkhtmltopdf path: {self.wkhtmltopdf_path}")
+        else:
+            # Try to find wkhtmltopdf in common locations if not in PATH
+            if IS_WINDOWS:
+                # Common Windows installation paths
+                possible_paths = [
+                    r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe',
+                    r'C:\Program Files (x86)\wkhtmltopdf\bin\wkhtmltopdf.exe',
+                    r'C:\wkhtmltopdf\bin\wkhtmltopdf.exe'
+                ]
+                for path in possible_paths:
+                    if os.path.exists(path):
+                        config = pdfkit.configuration(wkhtmltopdf=path, meta_tag_prefix=PDFKIT_META_TAG_PREFIX)
+                        self.logger.info(f"Found wkhtmltopdf at: {path}")
+                        break
+
+        if config is None:
+            # Look wkhtmltopdf up in PATH once instead of letting pdfkit do it per conversion
+            config = pdfkit.configuration(meta_tag_prefix=PDFKIT_META_TAG_PREFIX)
+
+        self._pdfkit_config = config
+        return config
+
+    def _add_base_tag(self, html_content: str, url: str) -> str:
+        """
+        Add a base tag for the given URL to the HTML, unless it already has one.
+        
+        Args:
+            html_content: HTML content to update
+            url: URL the page was downloaded from
+            
+        Returns:
+            str: The HTML content with a base tag
+        """
+        # Common case: splice the tag in right after <head>, no need to parse and serialize the page
+        if not BASE_TAG_PATTERN.search(html_content):
+            head_match = HEAD_OPEN_PATTERN.search(html_content)
+            if head_match:
+                end = head_match.end()
+                return f'{html_content[:end]}<base href="{html.escape(url, quote=True)}"/>{html_content[end:]}'
+        
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        if soup.find('base'):
+            return html_content
+            
+        base_tag = soup.new_tag('base', href=url)
+        if soup.head:
+            soup.head.insert(0, base_tag)
+        else:
+            head = soup.new_tag('head')
+            head.append(base_tag)
+            if soup.html:
+                soup.html.insert(0, head)
+            else:
+                soup.insert(0, head)
+        return str(soup)
+    
     def html_to_pdf(self, html_content: str, output_path: str, url: str = None) -> bool:
         """
         Convert HTML content to PDF.
@@ -123,79 +422,22 @@ class HtmlConverter:
         """
         try:
             # Create output directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Configure pdfkit options
-            options = {
-                'page-size': 'A4',
-                'margin-top': '0.75in',
-                'margin-right': '0.75in',
-                'margin-bottom': '0.75in',
-                'margin-left': '0.75in',
-                'encoding': "UTF-8",
-                'no-outline': None,
-                'enable-local-file-access': None
-            }
+            self.ensure_directory(os.path.dirname(output_path))
             
             # If we have a URL, add base tag to HTML for proper resource resolution
             if url:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                if not soup.find('base'):
-                    base_tag = soup.new_tag('base', href=url)
-                    if soup.head:
-                        soup.head.insert(0, base_tag)
-                    else:
-                        head = soup.new_tag('head')
-                        head.append(base_tag)
-                        if soup.html:
-                            soup.html.insert(0, head)
-                        else:
-                            soup.insert(0, head)
-                    html_content = str(soup)
-            
-            # Create temporary HTML file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as tmp_file:
-                tmp_file.write(html_content)
-                tmp_file_path = tmp_file.name
+                html_content = self._add_base_tag(html_content, url)
             
-            try:
-                # Convert to PDF using pdfkit
-                # Note: pdfkit requires wkhtmltopdf to be installed
-                config = None
-                
-                # First, check if a path was provided in configuration
-                if self.wkhtmltopdf_path and os.path.exists(self.wkhtmltopdf_path):
-                    config = pdfkit.configuration(wkhtmltopdf=self.wkhtmltopdf_path)
-                    self.logger.info(f"Using configured wkhtmltopdf path: {self.wkhtmltopdf_path}")
-                else:
-                    # Try to find wkhtmltopdf in common locations if not in PATH
-                    import platform
-                    if platform.system() == 'Windows':
-                        # Common Windows installation paths
-                        possible_paths = [
-                            r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe',
-                            r'C:\Program Files (x86)\wkhtmltopdf\bin\wkhtmltopdf.exe',
-                            r'C:\wkhtmltopdf\bin\wkhtmltopdf.exe'
-                        ]
-                        for path in possible_paths:
-                            if os.path.exists(path):
-                                config = pdfkit.configuration(wkhtmltopdf=path)
-                                self.logger.info(f"Found wkhtmltopdf at: {path}")
-                                break
-                
-                if config:
-                    pdfkit.from_file(tmp_file_path, output_path, options=options, configuration=config)
-                else:
-                    pdfkit.from_file(tmp_file_path, output_path, options=options)
-                self.logger.important(f"Successfully converted HTML to PDF: {output_path}")
-                return True
-                
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(tmp_file_path)
-                except:
-                    pass
+            # Convert to PDF using pdfkit
+            # Note: pdfkit requires wkhtmltopdf to be installed
+            config = self._get_pdfkit_config()
+
+            # Pipe the HTML to wkhtmltopdf's stdin, no temporary file needed. The config's
+            # PDFKIT_META_TAG_PREFIX keeps meta tags in the HTML from adding wkhtmltopdf options.
+            pdfkit.from_string(html_content, output_path, options=PDF_OPTIONS, configuration=config)
+            
+            self.logger.important(f"Successfully converted HTML to PDF: {output_path}")
+            return True
                     
         except Exception as e:
             self.logger.error(f"Failed to convert HTML to PDF: {e}")
@@ -214,35 +456,64 @@ class HtmlConverter:
         Returns:
             Optional[str]: Local filename if successful, None if failed
         """
-        try:
-            response = self.session.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # Create _resources subfolder
-            resources_dir = os.path.join(output_dir, "_resources")
-            os.makedirs(resources_dir, exist_ok=True)
-            
-            # Get file extension from content type or URL
-            content_type = response.headers.get('content-type', '')
-            if 'image/' in content_type:
-                ext = mimetypes.guess_extension(content_type)
-                if not ext:
-                    ext = '.png'  # Default fallback
-            else:
-                # Try to get extension from URL
-                parsed_url = urlparse(image_url)
-                path = parsed_url.path
-                ext = os.path.splitext(path)[1] if os.path.splitext(path)[1] else '.png'
-            
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            image_filename = f"Pasted image {timestamp}{ext}"
-            image_path = os.path.join(resources_dir, image_filename)
-            
-            # Save the image
-            with open(image_path, 'wb') as f:
-                f.write(response.content)
+        # Reuse an image already saved to this directory, as long as it still exists
+        cache_key = (output_dir, image_url)
+        with self._image_cache_lock:
+            cached_filename = self._image_cache.get(cache_key)
+            if cached_filename:
+                self._image_cache.move_to_end(cache_key)
+        if cached_filename and os.path.exists(os.path.join(output_dir, "_resources", cached_filename)):
+            self.logger.debug(f"Reusing downloaded image: {cached_filename}")
+            return cached_filename
             
+        try:
+            with self.session.get(image_url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                
+                # Create _resources subfolder
+                resources_dir = os.path.join(output_dir, "_resources")
+                self.ensure_directory(resources_dir)
+                
+                # Get file extension from content type or URL
+                content_type = response.headers.get('content-type', '')
+                if 'image/' in content_type:
+                    ext = mimetypes.guess_extension(content_type)
+                    if not ext:
+                        ext = '.png'  # Default fallback
+                else:
+                    # Try to get extension from URL
+                    parsed_url = urlparse(image_url)
+                    path = parsed_url.path
+                    ext = os.path.splitext(path)[1] if os.path.splitext(path)[1] else '.png'
+                
+                # Generate unique filename. Images downloaded in the same second, e.g. in
+                # parallel, get a counter; creating the file exclusively cannot race.
+                timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+                image_filename = f"Pasted image {timestamp}{ext}"
+                for counter in itertools.count(1):
+                    try:
+                        f = open(os.path.join(resources_dir, image_filename), 'xb')
+                        break
+                    except FileExistsError:
+                        image_filename = f"Pasted image {timestamp} {counter}{ext}"
+                
+                # Copy the image from the socket to the file chunk by chunk instead of holding
+                # all of it in memory, decompressing gzip/deflate transfer encodings on the way
+                response.raw.decode_content = True
+                try:
+                    with f:
+                        shutil.copyfileobj(response.raw, f, IMAGE_CHUNK_BYTES)
+                except Exception:
+                    # Don't leave a truncated image behind
+                    os.remove(f.name)
+                    raise
+            
+            with self._image_cache_lock:
+                self._image_cache[cache_key] = image_filename
+                self._image_cache.move_to_end(cache_key)
+                if len(self._image_cache) > IMAGE_CACHE_SIZE:
+                    self._image_cache.popitem(last=False)
+                    
             self.logger.debug(f"Downloaded image to _resources: {image_filename}")
             return image_filename  # Return just the filename, Obsidian will find it
             
@@ -263,7 +534,7 @@ class HtmlConverter:
         Returns:
             Dict[str, str]: Mapping of original image URLs to local filenames
         """
-        image_mapping = {}
+        image_urls = []
         
         # Find all img tags
         for img_tag in soup.find_all('img'):
@@ -271,20 +542,29 @@ class HtmlConverter:
             if not img_src:
                 continue
             
+            # Skip data URLs (base64 encoded images) and CID references, neither can be downloaded
+            if img_src.startswith(('data:', 'cid:')):
+                continue
+            
             # Convert relative URLs to absolute
             if base_url and not img_src.startswith(('http://', 'https://')):
                 img_src = urljoin(base_url, img_src)
             
-            # Skip data URLs (base64 encoded images)
-            if img_src.startswith('data:'):
-                continue
+            image_urls.append(img_src)
             
-            # Download the image
-            local_filename = self.download_image(img_src, output_dir, base_filename)
-            if local_filename:
-                image_mapping[img_src] = local_filename
-                
-        return image_mapping
+        if not image_urls:
+            return {}
+            
+        # Download the images in parallel, each download mostly waits on the network.
+        # An image used several times is only downloaded once.
+        image_urls = list(dict.fromkeys(image_urls))
+        with ThreadPoolExecutor(max_workers=min(len(image_urls), IMAGE_DOWNLOAD_WORKERS), thread_name_prefix="image") as executor:
+            local_filenames = executor.map(lambda image_url: self.download_image(image_url, output_dir, base_filename), image_urls)
+            return {
+                image_url: local_filename
+                for image_url, local_filename in zip(image_urls, local_filenames)
+                if local_filename
+            }
     
     def update_markdown_image_links(self, markdown_content: str, image_mapping: Dict[str, str]) -> str:
         """
@@ -297,23 +577,18 @@ class HtmlConverter:
         Returns:
             str: Updated markdown content
         """
-        for original_url, local_filename in image_mapping.items():
-            # Replace markdown image syntax with Obsidian-style
-            # ![alt text](url) -> ![[filename]]
-            markdown_content = re.sub(
-                r'!\[([^\]]*)\]\(' + re.escape(original_url) + r'\)',
-                f'![[{local_filename}]]',
-                markdown_content
-            )
-            
-            # Also handle HTML img tags that might have survived
-            markdown_content = re.sub(
-                r'<img[^>]*src=["\']' + re.escape(original_url) + r'["\'][^>]*>',
-                f'![[{local_filename}]]',
-                markdown_content
-            )
-        
-        return markdown_content
+        if not image_mapping:
+            return markdown_content
+            
+        # One pattern for all images, so the content is scanned once instead of twice per image
+        urls = '|'.join(re.escape(original_url) for original_url in image_mapping)
+        pattern = re.compile(
+            # Markdown image syntax: ![alt text](url) -> ![[filename]]
+            r'!\[[^\]]*\]\((' + urls + r')\)'
+            # Also HTML img tags that might have survived
+            r'|<img[^>]*src=["\'](' + urls + r')["\'][^>]*>'
+        )
+        return pattern.sub(lambda match: f'![[{image_mapping[match.group(1) or match.group(2)]}]]', markdown_content)
     
     def html_to_markdown(self, html_content: str, output_path: str, base_url: str = None, frontmatter: str = None) -> bool:
         """
@@ -331,58 +606,43 @@ class HtmlConverter:
         try:
             # Create output directory if it doesn't exist
             output_dir = os.path.dirname(output_path)
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Clean HTML before conversion
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Convert only 3+ consecutive <br> tags to reduce excessive spacing
-            # Keep single and double <br> tags as they represent intentional line breaks
-            html_str = str(soup)
-            # Replace 3+ consecutive <br> tags with double <br> to reduce spacing
-            html_str = re.sub(r'(<br\s*/?>[\s\n]*){3,}', '<br/><br/>', html_str)
-            # Remove empty paragraphs if any
-            html_str = re.sub(r'<p>\s*</p>', '', html_str)
-            
-            # Re-parse the cleaned HTML
-            soup = BeautifulSoup(html_str, 'html.parser')
-            
-            # Process embedded images first (before cleaning)
-            base_filename = os.path.splitext(os.path.basename(output_path))[0]
-            image_mapping = self.process_embedded_images(soup, output_dir, base_filename, base_url)
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'meta', 'link', 'head']):
-                element.decompose()
-            
-            # Remove inline style attributes from all elements
-            for element in soup.find_all(attrs={'style': True}):
-                del element['style']
-            
-            # Remove class attributes (often contain CSS class names)
-            for element in soup.find_all(attrs={'class': True}):
-                del element['class']
+            self.ensure_directory(output_dir)
+            
+            # Plain text has no tags to clean up and no images to download
+            has_tags = '<' in html_content
+            
+            # Clean HTML before conversion, on the raw string so it only needs to be parsed once
+            if has_tags:
+                # Convert only 3+ consecutive <br> tags to reduce excessive spacing
+                # Keep single and double <br> tags as they represent intentional line breaks
+                html_content = BR_RUN_PATTERN.sub('<br/><br/>', html_content)
+                # Remove empty paragraphs if any
+                html_content = EMPTY_PARAGRAPH_PATTERN.sub('', html_content)
+                
+            soup = BeautifulSoup(html_content, HTML_PARSER)
             
-            # Remove other common HTML attributes that don't translate well to markdown
-            unwanted_attrs = ['id', 'data-.*', 'aria-.*', 'role', 'tabindex', 'dir', 'lang']
-            for attr_pattern in unwanted_attrs:
+            image_mapping = {}
+            if has_tags:
+                # Process embedded images first (before cleaning)
+                base_filename = os.path.splitext(os.path.basename(output_path))[0]
+                image_mapping = self.process_embedded_images(soup, output_dir, base_filename, base_url)
+                
+                # Remove unwanted elements, inline styles, class names and other attributes
+                # that don't translate well to markdown, in a single pass over the tree
                 for element in soup.find_all():
-                    attrs_to_remove = []
-                    for attr in element.attrs:
-                        if re.match(attr_pattern, attr, re.IGNORECASE):
-                            attrs_to_remove.append(attr)
-                    for attr in attrs_to_remove:
-                        del element[attr]
-            
-            # Get cleaned HTML
-            cleaned_html = str(soup)
-            
-            # Convert HTML to Markdown with better options
-            markdown_content = md(
-                cleaned_html,
-                heading_style="ATX",  # Use # for headings instead of underlines
-                bullets="-"  # Use - for bullet points
-            )
+                    if element.decomposed:
+                        # Inside an element removed earlier in this pass
+                        continue
+                    if element.name in DROPPED_TAGS:
+                        element.decompose()
+                    elif element.attrs:
+                        element.attrs = {
+                            attr: value for attr, value in element.attrs.items()
+                            if attr not in STYLE_ATTRS and not UNWANTED_ATTR_PATTERN.match(attr)
+                        }
+            
+            # Convert the cleaned tree to Markdown directly, without serializing and parsing it again
+            markdown_content = MARKDOWN_CONVERTER.convert_soup(soup)
             
             # Update image links to Obsidian-style
             if image_mapping:
@@ -397,31 +657,27 @@ class HtmlConverter:
             markdown_content = markdown_content.replace('\r\n', '\n')
             markdown_content = markdown_content.replace('\r', '\n')
             
-            # Replace 3+ newlines with exactly 2 (preserve paragraph breaks)
-            markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
-            
-            # Clean up spaces followed by newlines
-            markdown_content = re.sub(r' +\n', '\n', markdown_content)
-            
-            # Clean up newlines followed by spaces
-            markdown_content = re.sub(r'\n +', '\n', markdown_content)
+            # Clean up spaces before and after newlines
+            markdown_content = LINE_EDGE_SPACES_PATTERN.sub('\n', markdown_content)
             
             # Remove multiple spaces within lines
-            markdown_content = re.sub(r'[ \t]+', ' ', markdown_content)
+            markdown_content = SPACE_RUN_PATTERN.sub(' ', markdown_content)
             
             # Remove empty lines that only contain spaces
-            markdown_content = re.sub(r'\n[ \t]+\n', '\n\n', markdown_content)
+            markdown_content = BLANK_LINE_PATTERN.sub('\n\n', markdown_content)
             
-            # Final cleanup: no more than 2 consecutive newlines
-            markdown_content = re.sub(r'\n{2,}', '\n\n', markdown_content)
+            # Final cleanup: no more than 2 consecutive newlines (preserve paragraph breaks)
+            markdown_content = DOUBLE_NEWLINE_PATTERN.sub('\n\n', markdown_content)
             
             # Remove leading/trailing newlines
             markdown_content = markdown_content.strip()
             
-            # Remove any remaining CSS-like content that might have leaked through
-            markdown_content = re.sub(r'{[^}]*}', '', markdown_content)  # Remove CSS rules
-            markdown_content = re.sub(r'@media[^{]*{[^}]*}', '', markdown_content)  # Remove media queries
-            markdown_content = re.sub(r'#[a-zA-Z_][a-zA-Z0-9_-]*\s*{[^}]*}', '', markdown_content)  # Remove ID selectors
+            # Remove any remaining CSS-like content that might have leaked through.
+            # All patterns need a brace, usually there is none left.
+            if '{' in markdown_content:
+                markdown_content = CSS_RULE_PATTERN.sub('', markdown_content)  # Remove CSS rules
+                markdown_content = CSS_MEDIA_PATTERN.sub('', markdown_content)  # Remove media queries
+                markdown_content = CSS_ID_SELECTOR_PATTERN.sub('', markdown_content)  # Remove ID selectors
 
             # Prepend frontmatter if provided
             if frontmatter:
@@ -501,21 +757,28 @@ class HtmlConverter:
 
                     # Replace any remaining CID references or local filename references
                     if cid_mapping:
-                        for cid_ref, local_filename in cid_mapping.items():
-                            # Replace markdown image syntax
-                            markdown_content = re.sub(
-                                r'!\[([^\]]*)\]\(' + re.escape(local_filename) + r'\)',
-                                f'![[{local_filename}]]',
-                                markdown_content
+                        # Replace markdown image syntax pointing at a local filename or a CID reference,
+                        # all references in a single pass
+                        # Only references that occur in the content go into the pattern
+                        link_targets = {local_filename: local_filename for local_filename in cid_mapping.values()}
+                        link_targets.update(cid_mapping)
+                        present_targets = [target for target in link_targets if target in markdown_content]
+                        if present_targets:
+                            image_pattern = re.compile(
+                                r'!\[[^\]]*\]\((' + '|'.join(re.escape(target) for target in present_targets) + r')\)'
                             )
-                            # Also handle any remaining CID references
-                            markdown_content = re.sub(
-                                r'!\[([^\]]*)\]\(' + re.escape(cid_ref) + r'\)',
-                                f'![[{local_filename}]]',
-                                markdown_content
+                            markdown_content = image_pattern.sub(
+                                lambda match: f'![[{link_targets[match.group(1)]}]]', markdown_content
                             )
-                            # Handle plain CID references that might remain
-                            markdown_content = markdown_content.replace(cid_ref, local_filename)
+                        
+                        # Handle plain CID references that might remain, longest first so
+                        # "cid:<id>" is replaced as a whole before the bare "<id>"
+                        present_refs = [cid_ref for cid_ref in cid_mapping if cid_ref in markdown_content]
+                        if present_refs:
+                            cid_pattern = re.compile(
+                                '|'.join(re.escape(cid_ref) for cid_ref in sorted(present_refs, key=len, reverse=True))
+                            )
+                            markdown_content = cid_pattern.sub(lambda match: cid_mapping[match.group()], markdown_content)
 
                     # Add attachment information if provided
                     if attachment_info:
@@ -578,4 +841,24 @@ class HtmlConverter:
             
         except Exception as e:
             self.logger.error(f"Failed to download and convert {url}: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def download_and_convert_many(self, items: List[Tuple[str, str, str]], max_workers: int = 4) -> List[bool]:
+        """
+        Download and convert several URLs in parallel.
+        Downloads mostly wait on the network and wkhtmltopdf runs in its own process,
+        so the number of workers is not tied to the number of CPUs.
+        
+        Args:
+            items: (url, output_path, target_format) tuples
+            max_workers: Maximum number of conversions running at the same time
+                
+        Returns:
+            List[bool]: Result of download_and_convert for each item, in the same order
+        """
+        if not items:
+            return []
+            
+        workers = min(len(items), max_workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="convert") as executor:
+            return list(executor.map(lambda item: self.download_and_convert(*item), items))
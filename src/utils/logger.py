@@ -3,11 +3,18 @@ Logger utility for application-wide logging.
 """
 import logging
 import os
-import glob
 import re
 from datetime import datetime, timedelta
 import atexit
 
+# Directory of the log files and the name pattern of the files written by this application,
+# the date they were created on is captured as YYYYMMDD
+LOG_DIRECTORY = 'logs'
+LOG_FILE_PATTERN = re.compile(r'imap_file_mover_(\d{8})_.*\.log')
+
+# Number of buffered log lines written to the log file at once, bounds the buffer of long-running processes
+FILE_FLUSH_LINES = 256
+
 
 class ConditionalFileHandler(logging.Handler):
     """
@@ -21,19 +28,27 @@ class ConditionalFileHandler(logging.Handler):
         self.formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         
     def emit(self, record):
-        self.buffer.append(record)
+        # Buffer the formatted line, so the record and its arguments are not kept alive.
+        # handle() calls this with the handler lock held.
+        self.buffer.append(self.format(record) + '\n')
+        if len(self.buffer) >= FILE_FLUSH_LINES:
+            self.flush()
         
     def flush(self):
-        if self.buffer:
-            # Only create the file if there are messages
-            try:
-                with open(self.filename, 'a') as f:
-                    for record in self.buffer:
-                        msg = self.formatter.format(record)
-                        f.write(msg + '\n')
-                self.buffer = []
-            except Exception:
-                self.handleError(None)
+        with self.lock:
+            if self.buffer:
+                # Only create the file if there are messages
+                try:
+                    with open(self.filename, 'a') as f:
+                        f.writelines(self.buffer)
+                    self.buffer = []
+                except Exception:
+                    self.handleError(None)
+                    
+    def close(self):
+        # Write what is left when logging shuts down
+        self.flush()
+        super().close()
 
 
 class Logger:
@@ -46,6 +61,7 @@ class Logger:
     def __new__(cls):
         """
         Singleton pattern to ensure only one logger instance exists.
+        Prefer the module-level logger instance, this keeps Logger() working.
         
         Returns:
             Logger: The singleton logger instance
@@ -70,27 +86,34 @@ class Logger:
         self._initialized = True
         self.retention_days = retention_days
         
-        # Create logs directory if it doesn't exist
-        os.makedirs('logs', exist_ok=True)
-        
-        # Clean up old log files
-        self.cleanup_old_logs()
+        # The log file is only set up by configure(), so importing this module touches no files
+        self.file_handler = None
         
         # Set up console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.WARNING)  # Default to WARNING level
         
         # Create formatter
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(formatter)
+        self.formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        console_handler.setFormatter(self.formatter)
         
         # Add console handler
         self.logger.addHandler(console_handler)
         
+    def _setup_file_handler(self):
+        """
+        Create the logs directory, clean up old log files and start logging to a new file.
+        """
+        # Create logs directory if it doesn't exist
+        os.makedirs(LOG_DIRECTORY, exist_ok=True)
+        
+        # Clean up old log files
+        self.cleanup_old_logs()
+        
         # Set up conditional file handler
-        log_filename = f"logs/imap_file_mover_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        log_filename = f"{LOG_DIRECTORY}/imap_file_mover_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         self.file_handler = ConditionalFileHandler(log_filename, logging.WARNING)
-        self.file_handler.setFormatter(formatter)
+        self.file_handler.setFormatter(self.formatter)
         self.logger.addHandler(self.file_handler)
         
         # Register flush method to be called at exit
@@ -99,65 +122,88 @@ class Logger:
     def configure(self, log_level: str, retention_days: int = None):
         """
         Configure the logger with the specified log level and retention days.
+        The first call starts writing the log file.
         
         Args:
             log_level: The log level to set (DEBUG, INFO, WARNING, ERROR, CRITICAL)
             retention_days: Number of days to keep log files
         """
+        if retention_days is not None:
+            self.retention_days = retention_days
+            
+        if self.file_handler is None:
+            self._setup_file_handler()
+        elif retention_days is not None:
+            self.cleanup_old_logs()
+            
         level = getattr(logging, log_level.upper(), logging.INFO)
         self.logger.setLevel(level)
         
         for handler in self.logger.handlers:
             handler.setLevel(level)
             
-        if retention_days is not None:
-            self.retention_days = retention_days
-            self.cleanup_old_logs()
+    def isEnabledFor(self, level: int) -> bool:
+        """
+        Check whether messages of the given level would be logged.
+        Named like the standard library method so either logger can be passed around.
+        
+        Args:
+            level: The log level, e.g. logging.DEBUG
             
-    def debug(self, message: str):
+        Returns:
+            bool: True if the level is enabled
+        """
+        return self.logger.isEnabledFor(level)
+        
+    def debug(self, message: str, *args):
         """
         Log a debug message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted lazily with args if given
+            args: Optional arguments for %-style formatting of the message
         """
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
         
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """
         Log an info message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted lazily with args if given
+            args: Optional arguments for %-style formatting of the message
         """
-        self.logger.info(message)
+        self.logger.info(message, *args)
         
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """
         Log a warning message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted lazily with args if given
+            args: Optional arguments for %-style formatting of the message
         """
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
         
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """
         Log an error message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted lazily with args if given
+            args: Optional arguments for %-style formatting of the message
         """
-        self.logger.error(message)
+        self.logger.error(message, *args)
         
-    def critical(self, message: str):
+    def critical(self, message: str, *args):
         """
         Log a critical message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted lazily with args if given
+            args: Optional arguments for %-style formatting of the message
         """
-        self.logger.critical(message)
+        self.logger.critical(message, *args)
         
     def important(self, message: str):
         """
@@ -167,49 +213,28 @@ class Logger:
         Args:
             message: The message to log
         """
-        # Save the current log level
-        current_level = self.logger.level
-        current_handler_levels = {}
-        
-        try:
-            # Temporarily set the log level to INFO for all handlers
-            self.logger.setLevel(logging.INFO)
-            for handler in self.logger.handlers:
-                current_handler_levels[handler] = handler.level
-                handler.setLevel(logging.INFO)
-                
-            # Log the message at INFO level
-            self.logger.info(message)
-        finally:
-            # Restore the original log levels
-            self.logger.setLevel(current_level)
-            for handler, level in current_handler_levels.items():
-                handler.setLevel(level)
+        # Hand an INFO record to the handlers directly, handle() skips the level checks.
+        # Nothing is changed on the logger, so messages of other threads keep their levels.
+        record = self.logger.makeRecord(self.logger.name, logging.INFO, "(unknown file)", 0, message, None, None)
+        for handler in self.logger.handlers:
+            handler.handle(record)
         
     def cleanup_old_logs(self):
         """
         Delete log files older than the retention period.
         """
         try:
-            # Get all log files
-            log_files = glob.glob('logs/imap_file_mover_*.log')
-            
-            # Get the cutoff date
-            cutoff_date = datetime.now() - timedelta(days=self.retention_days)
+            # Get the cutoff date. YYYYMMDD strings compare like the dates they stand for,
+            # and a file dated on the cutoff day counts from midnight, before the cutoff time.
+            cutoff_date = (datetime.now() - timedelta(days=self.retention_days)).strftime('%Y%m%d')
             
             # Extract date from filename and delete old files
-            for log_file in log_files:
-                match = re.search(r'imap_file_mover_(\d{8})_', log_file)
-                if match:
-                    date_str = match.group(1)
-                    try:
-                        file_date = datetime.strptime(date_str, '%Y%m%d')
-                        if file_date < cutoff_date:
-                            os.remove(log_file)
-                            print(f"Deleted old log file: {log_file}")
-                    except ValueError:
-                        # Skip files with invalid date format
-                        continue
+            with os.scandir(LOG_DIRECTORY) as entries:
+                for entry in entries:
+                    match = LOG_FILE_PATTERN.fullmatch(entry.name)
+                    if match and match.group(1) <= cutoff_date:
+                        os.remove(entry.path)
+                        print(f"Deleted old log file: {entry.path}")
         except Exception as e:
             print(f"Error cleaning up old logs: {e}")
     
@@ -217,5 +242,10 @@ class Logger:
         """
         Flush any buffered log messages to disk.
         """
-        if hasattr(self, 'file_handler'):
+        if self.file_handler is not None:
             self.file_handler.flush()
+
+
+# Application-wide logger instance. Logger() returns this same instance.
+# It logs to the console only until configure() is called.
+logger = Logger()
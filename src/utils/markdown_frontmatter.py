@@ -1,10 +1,41 @@
 """
 Markdown frontmatter generator with placeholder replacement for Obsidian properties.
 """
+import re
 from typing import Dict, Any, Optional
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 import yaml
 
+# libyaml based emitter where PyYAML was built with it, the pure Python emitter otherwise
+try:
+    from yaml import CSafeDumper as FastDumper
+except ImportError:
+    from yaml import SafeDumper as FastDumper
+
+# Options shared by both YAML emitters
+YAML_DUMP_OPTIONS = {
+    'default_flow_style': False,
+    'allow_unicode': True,
+    'sort_keys': False
+}
+
+# Supported placeholders and the email data field each one is replaced with
+PLACEHOLDER_FIELDS = {
+    '[email_from]': 'from',
+    '[email_to]': 'to',
+    '[email_subject]': 'subject',
+    '[email_datetime]': 'datetime',
+    '[email_date]': 'date',
+    '[email_time]': 'time'
+}
+
+# Common start of all placeholders
+PLACEHOLDER_PREFIX = '[email_'
+
+# Matches any supported placeholder, so a string is scanned once for all of them
+PLACEHOLDER_PATTERN = re.compile('|'.join(re.escape(placeholder) for placeholder in PLACEHOLDER_FIELDS))
+
 
 class FrontmatterGenerator:
     """
@@ -23,30 +54,41 @@ class FrontmatterGenerator:
         Returns:
             Any: The value with placeholders replaced
         """
-        if isinstance(value, str):
-            # Replace all supported placeholders
-            replacements = {
-                '[email_from]': email_data.get('from', ''),
-                '[email_to]': email_data.get('to', ''),
-                '[email_subject]': email_data.get('subject', ''),
-                '[email_datetime]': email_data.get('datetime', ''),
-                '[email_date]': email_data.get('date', ''),
-                '[email_time]': email_data.get('time', '')
-            }
+        # Build the replacements once for all nested values
+        replacements = {
+            placeholder: str(email_data.get(field, ''))
+            for placeholder, field in PLACEHOLDER_FIELDS.items()
+        }
+        return FrontmatterGenerator._replace_in_value(value, replacements)
 
-            for placeholder, replacement in replacements.items():
-                value = value.replace(placeholder, str(replacement))
+    @staticmethod
+    def _replace_in_value(value: Any, replacements: Dict[str, str]) -> Any:
+        """
+        Replace placeholders in a value using prepared replacements.
 
-            return value
+        Args:
+            value: The value to process (can be string, list, dict, or other types)
+            replacements: Mapping of placeholders to their replacement text
+
+        Returns:
+            Any: The value with placeholders replaced
+        """
+        if isinstance(value, str):
+            # Most values contain no placeholder at all, a substring check is enough for them
+            if PLACEHOLDER_PREFIX not in value:
+                return value
+
+            # Replace all supported placeholders in a single pass
+            return PLACEHOLDER_PATTERN.sub(lambda match: replacements[match.group()], value)
 
         elif isinstance(value, list):
             # Process each item in the list
-            return [FrontmatterGenerator.replace_placeholders(item, email_data) for item in value]
+            return [FrontmatterGenerator._replace_in_value(item, replacements) for item in value]
 
         elif isinstance(value, dict):
             # Process each value in the dictionary
             return {
-                key: FrontmatterGenerator.replace_placeholders(val, email_data)
+                key: FrontmatterGenerator._replace_in_value(val, replacements)
                 for key, val in value.items()
             }
 
@@ -73,12 +115,11 @@ class FrontmatterGenerator:
         processed_properties = FrontmatterGenerator.replace_placeholders(properties, email_data)
 
         # Convert to YAML format
-        yaml_content = yaml.dump(
-            processed_properties,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False
-        )
+        yaml_content = yaml.dump(processed_properties, Dumper=FastDumper, **YAML_DUMP_OPTIONS)
+        if '\\' in yaml_content:
+            # libyaml escapes characters like emoji and wraps escaped strings differently,
+            # keep the output of the Python emitter for those values
+            yaml_content = yaml.dump(processed_properties, **YAML_DUMP_OPTIONS)
 
         # Add YAML frontmatter delimiters
         frontmatter = f"---\n{yaml_content}---\n\n"
@@ -96,8 +137,6 @@ class FrontmatterGenerator:
         Returns:
             Dict[str, str]: Dictionary containing formatted datetime strings
         """
-        datetime_data = {}
-
         try:
             # Get the email date
             if hasattr(email_message, 'date') and email_message.date:
@@ -109,35 +148,40 @@ class FrontmatterGenerator:
                 elif isinstance(email_date, str):
                     # Try to parse common email date formats
                     # Email dates are typically in RFC 2822 format
-                    from email.utils import parsedate_to_datetime
                     try:
                         dt = parsedate_to_datetime(email_date)
-                    except:
+                    except (TypeError, ValueError):
                         # Fallback to current datetime if parsing fails
                         dt = datetime.now()
                 else:
                     dt = datetime.now()
-
-                # Format datetime in different ways
-                datetime_data['datetime'] = dt.strftime("%Y-%m-%d %H:%M:%S")
-                datetime_data['date'] = dt.strftime("%Y-%m-%d")
-                datetime_data['time'] = dt.strftime("%H:%M:%S")
             else:
                 # Use current datetime as fallback
-                now = datetime.now()
-                datetime_data['datetime'] = now.strftime("%Y-%m-%d %H:%M:%S")
-                datetime_data['date'] = now.strftime("%Y-%m-%d")
-                datetime_data['time'] = now.strftime("%H:%M:%S")
+                dt = datetime.now()
+
+            datetime_data = FrontmatterGenerator._split_datetime(dt)
 
         except Exception:
             # If anything goes wrong, use current datetime
-            now = datetime.now()
-            datetime_data['datetime'] = now.strftime("%Y-%m-%d %H:%M:%S")
-            datetime_data['date'] = now.strftime("%Y-%m-%d")
-            datetime_data['time'] = now.strftime("%H:%M:%S")
+            datetime_data = FrontmatterGenerator._split_datetime(datetime.now())
 
         return datetime_data
 
+    @staticmethod
+    def _split_datetime(dt: datetime) -> Dict[str, str]:
+        """
+        Format a datetime as combined, date and time strings with a single strftime call.
+
+        Args:
+            dt: The datetime to format
+
+        Returns:
+            Dict[str, str]: Dictionary with the datetime, date and time strings
+        """
+        formatted = dt.strftime("%Y-%m-%d %H:%M:%S")
+        date, time = formatted.split(' ')
+        return {'datetime': formatted, 'date': date, 'time': time}
+
     @staticmethod
     def build_email_data(email_message: Any) -> Dict[str, str]:
         """
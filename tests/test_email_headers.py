@@ -0,0 +1,41 @@
+"""
+Tests for decoding the headers used by the pre-check before messages are downloaded.
+"""
+import unittest
+
+from src.utils.email_headers import decode_header_value, parse_from_and_subject
+
+
+class ParseFromAndSubjectTest(unittest.TestCase):
+    """
+    Tests for parse_from_and_subject.
+    """
+
+    def test_raw_utf8_subject_and_from(self):
+        raw = b"From: J\xc3\xbcrgen M\xc3\xbcller <j@example.com>\r\nSubject: Rechnung f\xc3\xbcr M\xc3\xa4rz\r\n\r\n"
+        self.assertEqual(
+            parse_from_and_subject(raw),
+            ("Jürgen Müller <j@example.com>", "Rechnung für März")
+        )
+
+    def test_encoded_words_and_folding(self):
+        raw = b"From: sender@example.com\r\nSubject: =?utf-8?q?Rechnung_f=C3=BCr?=\r\n =?utf-8?q?_M=C3=A4rz?=\r\n\r\n"
+        self.assertEqual(parse_from_and_subject(raw), ("sender@example.com", "Rechnung für März"))
+
+    def test_missing_headers(self):
+        self.assertEqual(parse_from_and_subject(b"\r\n"), ("", ""))
+
+
+class DecodeHeaderValueTest(unittest.TestCase):
+    """
+    Tests for decode_header_value.
+    """
+
+    def test_plain_values(self):
+        self.assertEqual(decode_header_value("Invoice"), "Invoice")
+        self.assertEqual(decode_header_value(b"Invoice"), "Invoice")
+        self.assertEqual(decode_header_value(None), "")
+
+
+if __name__ == '__main__':
+    unittest.main()